@@ -0,0 +1,56 @@
+"""Admin dashboard indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def _has_payment_table():
+    return sa.inspect(op.get_bind()).has_table('payment')
+
+
+def upgrade():
+    # Index the created_at range filters used by the user statistics
+    op.create_index('ix_user_created_at', 'user', ['created_at'], unique=False)
+
+    # Index the status/plan counts used by the subscription statistics
+    op.create_index(
+        'ix_subscription_status_plan',
+        'subscription',
+        ['status', 'subscription_plan_id'],
+        unique=False
+    )
+
+    # Partial index for the active-subscription count
+    op.create_index(
+        'ix_subscription_active',
+        'subscription',
+        ['subscription_plan_id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+        sqlite_where=sa.text("status = 'ACTIVE'")
+    )
+
+    # Index the succeeded-payments-since-X revenue sum
+    # The payment table is created from the models rather than by a migration,
+    # so it may not exist yet
+    if _has_payment_table():
+        op.create_index('ix_payment_status_created', 'payment', ['status', 'created_at'], unique=False)
+
+
+def downgrade():
+    if _has_payment_table():
+        op.drop_index('ix_payment_status_created', table_name='payment')
+    op.drop_index('ix_subscription_active', table_name='subscription')
+    op.drop_index('ix_subscription_status_plan', table_name='subscription')
+    op.drop_index('ix_user_created_at', table_name='user')
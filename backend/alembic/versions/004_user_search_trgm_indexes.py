@@ -0,0 +1,33 @@
+"""User search trigram indexes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Trigram indexes are PostgreSQL-only
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Let the planner serve the admin user search's ILIKE '%term%' filters from an index
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute('CREATE INDEX ix_user_email_trgm ON "user" USING gin (email gin_trgm_ops)')
+    op.execute('CREATE INDEX ix_user_name_trgm ON "user" USING gin (name gin_trgm_ops)')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_user_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_user_email_trgm")
@@ -0,0 +1,29 @@
+"""Answer lookup indexes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Index the answer foreign keys used to load and filter answers
+    op.create_index(op.f('ix_answer_question_id'), 'answer', ['question_id'], unique=False)
+    op.create_index(op.f('ix_answer_interview_id'), 'answer', ['interview_id'], unique=False)
+
+    # Index the interview owner used when listing a user's answers
+    op.create_index(op.f('ix_interview_user_id'), 'interview', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_interview_user_id'), table_name='interview')
+    op.drop_index(op.f('ix_answer_interview_id'), table_name='answer')
+    op.drop_index(op.f('ix_answer_question_id'), table_name='answer')
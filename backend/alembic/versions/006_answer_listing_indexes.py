@@ -0,0 +1,35 @@
+"""Answer listing indexes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Index the newest-first answer listing for an interview; the composite
+    # index covers plain interview_id lookups, so the single-column one goes
+    op.create_index(
+        'ix_answer_interview_created',
+        'answer',
+        ['interview_id', 'created_at'],
+        unique=False
+    )
+    op.drop_index(op.f('ix_answer_interview_id'), table_name='answer')
+
+    # Index the unfiltered newest-first listing and the monthly answer counts
+    op.create_index('ix_answer_created_at', 'answer', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_answer_created_at', table_name='answer')
+    op.create_index(op.f('ix_answer_interview_id'), 'answer', ['interview_id'], unique=False)
+    op.drop_index('ix_answer_interview_created', table_name='answer')
@@ -0,0 +1,59 @@
+"""Billing and payment listing indexes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def _has_payment_table():
+    return sa.inspect(op.get_bind()).has_table('payment')
+
+
+def upgrade():
+    # Index the newest-first billing history listings for a user or subscription
+    op.create_index(
+        'ix_billing_history_user_event_time',
+        'billing_history',
+        ['user_id', 'event_time'],
+        unique=False
+    )
+    op.create_index(
+        'ix_billing_history_subscription_event_time',
+        'billing_history',
+        ['subscription_id', 'event_time'],
+        unique=False
+    )
+
+    # Partial index for the customer-facing (visible only) user listing
+    op.create_index(
+        'ix_billing_history_user_visible_event_time',
+        'billing_history',
+        ['user_id', 'event_time'],
+        unique=False,
+        postgresql_where=sa.text("is_visible_to_customer = true"),
+        sqlite_where=sa.text("is_visible_to_customer = 1")
+    )
+
+    # Index the newest-first payment listing for a user
+    # The payment table is created from the models rather than by a migration,
+    # so it may not exist yet
+    if _has_payment_table():
+        op.create_index('ix_payment_user_created', 'payment', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    if _has_payment_table():
+        op.drop_index('ix_payment_user_created', table_name='payment')
+    op.drop_index('ix_billing_history_user_visible_event_time', table_name='billing_history')
+    op.drop_index('ix_billing_history_subscription_event_time', table_name='billing_history')
+    op.drop_index('ix_billing_history_user_event_time', table_name='billing_history')
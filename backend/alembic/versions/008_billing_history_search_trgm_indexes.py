@@ -0,0 +1,45 @@
+"""Billing history search trigram indexes
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# Columns matched by the admin billing history search
+SEARCH_COLUMNS = (
+    'description',
+    'invoice_id',
+    'stripe_event_id',
+    'stripe_invoice_id',
+    'stripe_payment_intent_id',
+)
+
+
+def upgrade():
+    # Trigram indexes are PostgreSQL-only
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Let the planner serve the admin billing search's ILIKE '%term%' filters from an index
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in SEARCH_COLUMNS:
+        op.execute(
+            f'CREATE INDEX ix_billing_history_{column}_trgm '
+            f'ON billing_history USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for column in reversed(SEARCH_COLUMNS):
+        op.execute(f"DROP INDEX IF EXISTS ix_billing_history_{column}_trgm")
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from uuid import UUID
+from datetime import datetime
 
 from app.db.session import get_db
 from app.core.security import get_current_user, has_role, has_permission
@@ -15,7 +16,6 @@ from app.schemas.admin import (
     AdminUserUpdate
 )
 from app.schemas.user import (
-    UserResponse, 
     UserAdminResponse, 
     UserRoleUpdate,
     UserStatusUpdate
@@ -54,7 +54,7 @@ async def get_dashboard_stats(
     """
     Get comprehensive statistics for the admin dashboard.
     """
-    stats = get_admin_dashboard_stats(db)
+    stats = await get_admin_dashboard_stats(db)
     return stats
 
 
@@ -83,22 +83,30 @@ async def list_users(
     limit: int = 100,
     search: Optional[str] = None,
     role_filter: Optional[UserRole] = None,
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[str] = None,
     user: User = Depends(users_read),
     db: Session = Depends(get_db)
 ):
     """
     Get all users with pagination and optional search.
+    
+    Pass the created_at and id of the last user on the previous page as
+    after_created_at/after_id for cursor pagination.
     """
+    cursor = (after_created_at, after_id) if after_created_at and after_id else None
+    
     users, total_count = get_admin_users(
         db,
         skip=skip,
         limit=limit,
         search=search,
-        role_filter=role_filter
+        role_filter=role_filter,
+        cursor=cursor
     )
     
     return AdminUserManagement(
-        users=[UserResponse.model_validate(user) for user in users],
+        users=users,
         total_count=total_count
     )
 
@@ -133,7 +141,7 @@ async def update_user(
     Update a user as admin.
     """
     try:
-        updated_user = admin_update_user(db, user_id, user_update)
+        updated_user = await admin_update_user(db, user_id, user_update)
         return updated_user
     except ValueError as e:
         raise HTTPException(
@@ -6,7 +6,6 @@ import uuid
 import logging
 from datetime import datetime
 from app.services.transcription import default_transcription_service, TranscriptionProvider, TranscriptionServiceFactory
-from app.services.ai import default_ai_service, AIProvider, AIServiceFactory
 from app.services import audio_utils
 
 from app.db.session import get_db
@@ -82,7 +81,7 @@ async def upload_audio(
                 processed_filepath = os.path.join(upload_dir, processed_filename)
                 
                 # Preprocess the audio file
-                filepath = audio_utils.prepare_for_transcription(
+                filepath, processed_duration = await audio_utils.prepare_for_transcription(
                     input_path=original_filepath,
                     output_path=processed_filepath,
                     normalize=True,
@@ -92,12 +91,9 @@ async def upload_audio(
                     target_channels=1  # Mono is better for speech recognition
                 )
                 
-                # Get audio information for the processed file
-                audio_info = audio_utils.get_audio_info(filepath)
-                
                 # Update duration if not provided
-                if duration is None and "duration" in audio_info:
-                    duration = audio_info["duration"]
+                if duration is None:
+                    duration = processed_duration
                     
                 logger.info(f"Preprocessed audio file: {filepath}, duration: {duration}s")
                 
@@ -275,8 +271,10 @@ async def get_service_info(
     
     This is useful for debugging and for displaying service information in the UI.
     """
+    from app.services.ai import get_default_ai_service
+    
     transcription_service = default_transcription_service
-    ai_service = default_ai_service
+    ai_service = get_default_ai_service()
     
     # Check if FFmpeg is installed
     ffmpeg_installed = audio_utils.check_ffmpeg_installed()
@@ -350,14 +348,14 @@ async def process_audio_file(
         
         if remove_silence and audio_utils.check_ffmpeg_installed():
             # Remove silence first if requested
-            silence_removed_path = audio_utils.remove_silence(
+            silence_removed_path = await audio_utils.remove_silence(
                 input_path=temp_filepath,
                 silence_threshold=-50.0  # Default threshold
             )
             temp_filepath = silence_removed_path
         
         # Prepare the audio file with requested processing
-        processed_filepath = audio_utils.prepare_for_transcription(
+        processed_filepath, _ = await audio_utils.prepare_for_transcription(
             input_path=temp_filepath,
             output_path=processed_filepath,
             normalize=normalize,
@@ -368,7 +366,7 @@ async def process_audio_file(
         )
         
         # Get audio information
-        audio_info = audio_utils.get_audio_info(processed_filepath)
+        audio_info = await audio_utils.get_audio_info(processed_filepath)
         
         # Clean up temporary file
         if os.path.exists(temp_filepath) and temp_filepath != processed_filepath:
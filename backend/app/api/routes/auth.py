@@ -41,7 +41,6 @@ from app.schemas.auth import (
     OAuthCallback,
     EmailVerificationRequest,
     EmailVerificationConfirm,
-    UserRoleUpdate,
     PermissionCreate,
     PermissionResponse,
     UserPermissionUpdate,
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Body, He
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import logging
-import json
+from datetime import datetime
+import orjson
 
 from app.db.session import get_db
 from app.core.security import get_current_user
@@ -200,11 +201,16 @@ async def get_payment_history(
     limit: int = 100,
     payment_type: Optional[PaymentType] = None,
     status: Optional[PaymentStatus] = None,
+    before_time: Optional[datetime] = None,
+    before_id: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get payment history for the current user.
+    
+    For deep pages, pass the created_at and id of the last item received as
+    `before_time` and `before_id` instead of increasing `skip`.
     """
     payments = get_user_payments(
         db,
@@ -212,7 +218,9 @@ async def get_payment_history(
         skip=skip,
         limit=limit,
         payment_type=payment_type,
-        status=status
+        status=status,
+        before_time=before_time,
+        before_id=before_id
     )
     return payments
 
@@ -267,14 +275,14 @@ async def get_payment_methods_endpoint(
             return CustomerPaymentMethods(payment_methods=[])
         
         # Parse plan data to get customer ID
-        plan_data = json.loads(subscription.plan_data)
+        plan_data = orjson.loads(subscription.plan_data)
         customer_id = plan_data.get("stripe_customer_id")
         
         if not customer_id:
             return CustomerPaymentMethods(payment_methods=[])
         
         # Get payment methods
-        payment_methods = get_payment_methods(
+        payment_methods = await get_payment_methods(
             user_id=current_user["id"],
             stripe_customer_id=customer_id
         )
@@ -311,16 +319,15 @@ async def stripe_webhook(
     try:
         # Read the request body
         payload = await request.body()
-        payload_str = payload.decode("utf-8")
         
-        # Parse the payload
-        event_data = json.loads(payload_str)
+        # Parse the payload straight from bytes
+        event_data = orjson.loads(payload)
         
         # Verify webhook signature if available
         if stripe_signature and settings.STRIPE_WEBHOOK_SECRET:
             from app.services.stripe_service import construct_event
             try:
-                event_data = construct_event(json.loads(payload_str), stripe_signature)
+                event_data = construct_event(event_data, stripe_signature)
             except Exception as e:
                 logger.error(f"Error validating webhook signature: {str(e)}")
                 raise HTTPException(
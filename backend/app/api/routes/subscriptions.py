@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import logging
+from datetime import datetime
 
 from app.db.session import get_db
 from app.core.security import get_current_user
@@ -13,7 +14,7 @@ from app.schemas.subscription import (
     SubscriptionUpgradeRequest,
     BillingPortalRequest,
     BillingPortalResponse,
-    BillingHistoryResponse,
+    BillingHistoryListItem,
     PlanDetails
 )
 from app.services.subscription import (
@@ -263,16 +264,21 @@ async def create_billing_portal(
         )
 
 
-@router.get("/billing-history", response_model=List[BillingHistoryResponse])
+@router.get("/billing-history", response_model=List[BillingHistoryListItem])
 async def get_billing_history(
     skip: int = 0,
     limit: int = 100,
     event_type: Optional[BillingEventType] = None,
+    before_time: Optional[datetime] = None,
+    before_id: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get billing history for the current user.
+    
+    For deep pages, pass the event_time and id of the last item received as
+    `before_time` and `before_id` instead of increasing `skip`.
     """
     try:
         history = get_user_billing_history(
@@ -280,7 +286,9 @@ async def get_billing_history(
             user_id=current_user["id"],
             skip=skip,
             limit=limit,
-            event_type=event_type
+            event_type=event_type,
+            before_time=before_time,
+            before_id=before_id
         )
         return history
     except Exception as e:
@@ -6,6 +6,7 @@ import logging
 
 from app.db.session import get_db
 from app.core.config import settings
+from app.core.cache import invalidate_cache, ADMIN_DASHBOARD_CACHE_KEY
 from app.services.subscription import process_subscription_updated, process_subscription_deleted
 from app.services.payment import process_payment_succeeded, process_payment_failed
 from app.models.billing_history import BillingEventType
@@ -97,6 +98,10 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
                 logger.info(f"Charge failed: {data['id']}, reason: {data.get('failure_message')}")
                 
         # Add more event types as needed
+        
+        # Subscription and payment events change the admin dashboard figures
+        if event_type.startswith(("customer.subscription", "invoice")):
+            invalidate_cache(ADMIN_DASHBOARD_CACHE_KEY)
                 
         return WebhookPayloadResponse(
             received=True,
@@ -0,0 +1,163 @@
+from typing import Any, Callable, Optional, Tuple, Type
+from collections import OrderedDict
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import time
+
+import orjson
+from pydantic import BaseModel
+
+from app.core.security import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Well-known cache keys, shared between the services that fill and invalidate them
+ADMIN_DASHBOARD_CACHE_KEY = "admin:dashboard:v1"
+PAYMENT_STATISTICS_CACHE_KEY = "stats:payments:v1"
+BILLING_STATISTICS_CACHE_KEY = "stats:billing:v1"
+QUESTION_STATISTICS_CACHE_KEY = "stats:questions:v1"
+QUESTION_CATEGORIES_CACHE_KEY = "stats:question_categories:v1"
+
+# In-process fallback used when Redis is unreachable: key -> (expires_at, payload),
+# least recently used first
+LOCAL_CACHE_MAX_ENTRIES = 1024
+_local_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+# cached() may run loads and stores on worker threads
+_local_cache_lock = threading.Lock()
+
+
+def cache_get(key: str) -> Optional[bytes]:
+    """
+    Read a raw payload from Redis, falling back to the in-process cache.
+    """
+    try:
+        value = redis_client.get(key)
+        if isinstance(value, bytes):
+            return value
+    except Exception as e:
+        logger.debug(f"Cache read failed for {key}: {str(e)}")
+
+    # A miss may just mean the entry was written locally (e.g. when security.py
+    # swapped in its in-memory rate limiter, which has no setex)
+
+    with _local_cache_lock:
+        entry = _local_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            _local_cache.move_to_end(key)
+            return entry[1]
+    return None
+
+
+def cache_set(key: str, value: bytes, ttl: int) -> None:
+    """
+    Store a raw payload in Redis, falling back to the in-process cache.
+    """
+    try:
+        redis_client.setex(key, ttl, value)
+        return
+    except Exception as e:
+        logger.debug(f"Cache write failed for {key}: {str(e)}")
+
+    now = time.monotonic()
+    with _local_cache_lock:
+        for expired in [k for k, (expires_at, _) in _local_cache.items() if expires_at <= now]:
+            del _local_cache[expired]
+
+        _local_cache[key] = (now + ttl, value)
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > LOCAL_CACHE_MAX_ENTRIES:
+            _local_cache.popitem(last=False)
+
+
+def invalidate_cache(*keys: str) -> None:
+    """
+    Drop cached results so the next call recomputes them.
+    """
+    for key in keys:
+        with _local_cache_lock:
+            _local_cache.pop(key, None)
+        try:
+            redis_client.delete(key)
+        except Exception as e:
+            logger.debug(f"Cache invalidation failed for {key}: {str(e)}")
+
+
+def invalidate_cache_prefix(prefix: str) -> None:
+    """
+    Drop every cached result whose key starts with `prefix`.
+    """
+    with _local_cache_lock:
+        for key in [key for key in _local_cache if key.startswith(prefix)]:
+            del _local_cache[key]
+    try:
+        keys = list(redis_client.scan_iter(match=f"{prefix}*"))
+        if keys:
+            redis_client.delete(*keys)
+    except Exception as e:
+        logger.debug(f"Cache invalidation failed for {prefix}*: {str(e)}")
+
+
+def _dump_model(obj: Any) -> Any:
+    """
+    orjson fallback serializer for Pydantic models.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def cached(ttl: int, key: str, model: Optional[Type[BaseModel]] = None) -> Callable:
+    """
+    Cache a function's result for `ttl` seconds under `key`.
+
+    Works on both plain and async functions. Results are serialized with
+    orjson, including any Pydantic models nested in them; if `model` is given
+    the cached value (or each item of a cached list) is rebuilt as that
+    Pydantic model on a hit.
+    """
+    _missing = object()
+
+    def load() -> Any:
+        raw = cache_get(key)
+        if raw is not None:
+            try:
+                data = orjson.loads(raw)
+                if model is None:
+                    return data
+                if isinstance(data, list):
+                    return [model.model_validate(item) for item in data]
+                return model.model_validate(data)
+            except Exception as e:
+                logger.warning(f"Discarding unreadable cache entry {key}: {str(e)}")
+        return _missing
+
+    def store(result: Any) -> None:
+        cache_set(key, orjson.dumps(result, default=_dump_model), ttl)
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                # Redis calls are blocking, so keep them off the event loop
+                result = await asyncio.to_thread(load)
+                if result is _missing:
+                    result = await func(*args, **kwargs)
+                    await asyncio.to_thread(store, result)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            result = load()
+            if result is _missing:
+                result = func(*args, **kwargs)
+                store(result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -19,6 +19,7 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     CSRF_SECRET_KEY: str = os.getenv("CSRF_SECRET_KEY", "csrf-secret-key")  # Change in production!
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))  # Each +1 doubles hashing cost
     
     # Redis for rate limiting, session management, and token blacklisting
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -90,6 +91,8 @@ class Settings(BaseSettings):
     AI_RATE_LIMIT_REQUESTS_PER_DAY: int = int(os.getenv("AI_RATE_LIMIT_REQUESTS_PER_DAY", "1000"))
     AI_CACHE_ENABLED: bool = os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
     AI_CACHE_TTL: int = int(os.getenv("AI_CACHE_TTL", "3600"))  # 1 hour by default
+    AI_CACHE_BACKEND: str = os.getenv("AI_CACHE_BACKEND", "memory")  # "memory" or "redis"
+    FEEDBACK_CACHE_TTL: int = int(os.getenv("FEEDBACK_CACHE_TTL", str(30 * 24 * 3600)))  # 30 days by default
     
     # Transcription Service Configuration
     TRANSCRIPTION_PROVIDER: str = os.getenv("TRANSCRIPTION_PROVIDER", "mock")  # "deepgram" or "mock"
@@ -20,11 +20,11 @@ from app.db.session import get_db
 
 # =========== Password Hashing ===========
 
-# Password hashing context - using bcrypt with appropriate rounds
+# Password hashing context - using bcrypt with configurable rounds
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
-    bcrypt__rounds=12
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
 )
 
 # =========== Rate Limiting ===========
@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
@@ -10,6 +11,14 @@ engine = create_engine(
     connect_args={} if "postgresql" in settings.DATABASE_URL else {"check_same_thread": False}
 )
 
+# SQLite only enforces foreign keys when asked to, once per connection
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 # Create a session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -26,3 +35,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    """
+    Check whether an IntegrityError was raised by a foreign key constraint.
+    
+    Matches both PostgreSQL's and SQLite's error messages.
+    """
+    return "foreign key" in str(error.orig).lower()
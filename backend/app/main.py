@@ -1,6 +1,6 @@
 from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 import time
@@ -26,6 +26,7 @@ app = FastAPI(
     description=settings.PROJECT_DESCRIPTION,
     version=settings.PROJECT_VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
 # Rate limiting middleware
@@ -118,6 +119,14 @@ async def health_check():
 async def init_app():
     check_and_init_db()
 
+# Close the AI service's HTTP connections if it was ever created
+@app.on_event("shutdown")
+async def close_ai_service():
+    from app.services.ai import get_default_ai_service
+    
+    if get_default_ai_service.cache_info().currsize:
+        await get_default_ai_service().aclose()
+
 # Include API routes
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Index, func
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 
@@ -9,6 +9,14 @@ class Answer(Base):
     """
     Answer model for storing user responses to interview questions.
     """
+    __table_args__ = (
+        # Backs the newest-first answer listing for an interview; also serves
+        # plain interview_id lookups through its leading column
+        Index("ix_answer_interview_created", "interview_id", "created_at"),
+        # Backs the unfiltered newest-first listing and the monthly counts
+        Index("ix_answer_created_at", "created_at"),
+    )
+
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid4()))
     content = Column(Text, nullable=True)  # Transcribed text
     audio_url = Column(String, nullable=True)  # URL to stored audio file
@@ -20,7 +28,7 @@ class Answer(Base):
     
     # Foreign keys
     interview_id = Column(String, ForeignKey("interview.id", ondelete="CASCADE"), nullable=False)
-    question_id = Column(String, ForeignKey("question.id", ondelete="CASCADE"), nullable=False)
+    question_id = Column(String, ForeignKey("question.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Relationships
     interview = relationship("Interview", back_populates="answers")
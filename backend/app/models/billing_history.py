@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Float, Text, JSON, Boolean, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Float, Text, JSON, Boolean, Index, func, text
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 import enum
@@ -40,6 +40,20 @@ class BillingHistory(Base):
     """
     BillingHistory model for storing the billing and payment history.
     """
+    __table_args__ = (
+        # Back the newest-first billing history listings for a user or subscription
+        Index("ix_billing_history_user_event_time", "user_id", "event_time"),
+        Index("ix_billing_history_subscription_event_time", "subscription_id", "event_time"),
+        # Partial index for the customer-facing (visible only) user listing
+        Index(
+            "ix_billing_history_user_visible_event_time",
+            "user_id",
+            "event_time",
+            postgresql_where=text("is_visible_to_customer = true"),
+            sqlite_where=text("is_visible_to_customer = 1"),
+        ),
+    )
+
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid4()))
     
     # Event information
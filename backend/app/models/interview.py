@@ -45,7 +45,7 @@ class Interview(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Foreign keys
-    user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Relationships
     user = relationship("User", back_populates="interviews")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Enum, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Enum, Index, func
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 import enum
@@ -31,6 +31,13 @@ class Payment(Base):
     """
     Payment model for tracking user payments.
     """
+    __table_args__ = (
+        # Backs the revenue-by-status-and-period sums on the admin dashboard
+        Index("ix_payment_status_created", "status", "created_at"),
+        # Backs the newest-first payment listing for a user
+        Index("ix_payment_user_created", "user_id", "created_at"),
+    )
+
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid4()))
     stripe_payment_id = Column(String, unique=True, nullable=False)
     amount = Column(Float, nullable=False)
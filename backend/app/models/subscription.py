@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Enum, JSON, Float, Text, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Enum, JSON, Float, Text, Index, func, text
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 import enum
@@ -33,6 +33,18 @@ class Subscription(Base):
     """
     Subscription model for tracking user subscriptions.
     """
+    __table_args__ = (
+        # Backs the status/plan counts on the admin dashboard
+        Index("ix_subscription_status_plan", "status", "subscription_plan_id"),
+        # Partial index for the very common active-subscription count
+        Index(
+            "ix_subscription_active",
+            "subscription_plan_id",
+            postgresql_where=text("status = 'ACTIVE'"),
+            sqlite_where=text("status = 'ACTIVE'"),
+        ),
+    )
+
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid4()))
     
     # Identifiers and status
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, func, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, func, Table, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 import enum
@@ -52,6 +52,11 @@ class User(Base):
     """
     User model for storing user information.
     """
+    __table_args__ = (
+        # Backs the created_at range counts on the admin dashboard
+        Index("ix_user_created_at", "created_at"),
+    )
+
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid4()))
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=True)  # Can be null for OAuth users
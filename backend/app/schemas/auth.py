@@ -89,14 +89,6 @@ class EmailVerificationConfirm(BaseModel):
     token: str
 
 
-class UserRoleUpdate(BaseModel):
-    """
-    Schema for updating a user's role.
-    """
-    user_id: str
-    role: str
-
-
 class PermissionCreate(BaseModel):
     """
     Schema for creating a new permission.
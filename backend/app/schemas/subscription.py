@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, ValidationInfo, field_validator
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
+import orjson
 
 from app.models.subscription import SubscriptionStatus, SubscriptionBillingPeriod
 from app.models.billing_history import BillingEventType, PaymentStatus
@@ -52,6 +53,16 @@ class SubscriptionUpdate(BaseModel):
     subscription_metadata: Optional[str] = None
 
 
+class SubscriptionMetadata(BaseModel):
+    """
+    Schema for the metadata stored on a subscription.
+    """
+    model_config = ConfigDict(extra="allow")
+    
+    stripe_customer_id: Optional[str] = None
+    price_id: Optional[str] = None
+
+
 class SubscriptionResponse(SubscriptionBase):
     """
     Schema for subscription response data.
@@ -62,7 +73,7 @@ class SubscriptionResponse(SubscriptionBase):
     user_id: str
     
     # Plan details
-    plan_details: Optional[Dict[str, Any]] = None
+    plan_details: Optional["PlanDetails"] = None
     
     # Stripe details
     stripe_subscription_id: Optional[str] = None
@@ -86,12 +97,30 @@ class SubscriptionResponse(SubscriptionBase):
     latest_invoice_id: Optional[str] = None
     
     # Metadata
-    subscription_metadata: Optional[Dict[str, Any]] = None
+    subscription_metadata: Optional[SubscriptionMetadata] = None
     
     # Timestamps
     created_at: datetime
     updated_at: datetime
 
+    @field_validator("subscription_metadata", mode="before")
+    @classmethod
+    def parse_subscription_metadata(cls, v):
+        # Metadata is stored as a JSON string; decode it with orjson
+        return orjson.loads(v) if isinstance(v, (bytes, str)) else v
+
+    @field_validator("plan_details", mode="before")
+    @classmethod
+    def build_plan_details(cls, v, info: ValidationInfo):
+        # The ORM relationship is a SubscriptionPlan; present it as PlanDetails
+        # priced for this subscription's billing period
+        if v is None or isinstance(v, (PlanDetails, dict)):
+            return v
+        from app.services.subscription_plan_service import get_plan_details
+        
+        billing_period = info.data.get("billing_period", SubscriptionBillingPeriod.MONTHLY)
+        return get_plan_details(v, billing_cycle=SubscriptionBillingPeriod(billing_period).value)
+
 
 class SubscriptionCreateRequest(BaseModel):
     """
@@ -132,12 +161,22 @@ class BillingPortalResponse(BaseModel):
     url: str
 
 
+class StripeWebhookData(BaseModel):
+    """
+    Schema for the data section of a Stripe webhook event.
+    """
+    model_config = ConfigDict(extra="allow")
+    
+    object: Dict[str, Any]
+    previous_attributes: Optional[Dict[str, Any]] = None
+
+
 class SubscriptionWebhookPayload(BaseModel):
     """
     Schema for Stripe webhook payload processing.
     """
     type: str
-    data: Dict[str, Any]
+    data: StripeWebhookData
 
 
 class PlanFeature(BaseModel):
@@ -207,3 +246,36 @@ class BillingHistoryResponse(BaseModel):
     
     # Timestamps
     created_at: datetime
+
+
+class BillingHistoryListItem(BaseModel):
+    """
+    Narrow schema for billing history list views.
+    
+    Use BillingHistoryResponse when the full record is needed.
+    """
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: str
+    event_type: BillingEventType
+    event_time: datetime
+    amount: Optional[float] = None
+    currency: Optional[str] = None
+    payment_status: Optional[PaymentStatus] = None
+    description: Optional[str] = None
+    invoice_url: Optional[str] = None
+    receipt_url: Optional[str] = None
+
+
+# Finish any schema left incomplete at class creation now rather than on the first request
+for _model in (
+    SubscriptionResponse,
+    PlanFeature,
+    PlanDetails,
+    BillingHistoryResponse,
+    BillingHistoryListItem,
+    SubscriptionWebhookPayload,
+):
+    if not _model.__pydantic_complete__:
+        _model.model_rebuild()
+del _model
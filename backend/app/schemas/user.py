@@ -153,3 +153,15 @@ class UserStatusUpdate(BaseModel):
         if v not in UserStatus.__members__.values():
             raise ValueError(f'Invalid status: {v}')
         return v
+
+
+# Finish any schema left incomplete at class creation now rather than on the first request
+for _model in (
+    UserResponse,
+    UserAdminResponse,
+    UserPermissionResponse,
+    UserRoleResponse,
+):
+    if not _model.__pydantic_complete__:
+        _model.model_rebuild()
+del _model
@@ -1,6 +1,7 @@
 from typing import Optional, List, Dict, Any, Union, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, tuple_
+import asyncio
 import logging
 from datetime import datetime, timedelta
 
@@ -19,27 +20,58 @@ from app.schemas.admin import (
     AdminDashboardStats
 )
 from app.core.security import get_password_hash
+from app.core.cache import cached, ADMIN_DASHBOARD_CACHE_KEY
 from app.services.user import create_user
-from app.schemas.user import UserCreate
+from app.schemas.user import UserCreate, UserResponse
 
 logger = logging.getLogger(__name__)
 
+# Dashboard stats change slowly; cache them briefly (invalidated on subscription/payment changes)
+ADMIN_DASHBOARD_CACHE_TTL = 60
 
-def get_admin_dashboard_stats(db: Session) -> AdminDashboardStats:
-    """
-    Get comprehensive statistics for the admin dashboard.
+# Columns read for the admin user list, in UserResponse field order
+_USER_RESPONSE_FIELDS = tuple(UserResponse.model_fields)
+_USER_RESPONSE_COLUMNS = tuple(getattr(User, field) for field in _USER_RESPONSE_FIELDS)
+
+
+async def _run_in_own_session(db: Session, func, *args):
     """
-    # Get user statistics
-    user_stats = get_user_statistics(db)
+    Run a sync query function in a worker thread with its own session.
     
-    # Get subscription statistics
-    subscription_stats = get_subscription_statistics(db)
+    Sessions aren't thread-safe, so each concurrent query gets a fresh one
+    bound to the same engine as `db`.
+    """
+    def run():
+        with Session(bind=db.get_bind()) as session:
+            return func(session, *args)
     
-    # Get user activity statistics
-    activity_stats = get_user_activity_statistics(db)
+    return await asyncio.to_thread(run)
+
+
+@cached(ttl=ADMIN_DASHBOARD_CACHE_TTL, key=ADMIN_DASHBOARD_CACHE_KEY, model=AdminDashboardStats)
+async def get_admin_dashboard_stats(db: Session) -> AdminDashboardStats:
+    """
+    Get comprehensive statistics for the admin dashboard.
     
-    # Get revenue for last 30 days
-    revenue_last_30_days = get_revenue_last_30_days(db)
+    The result is identical for every admin and changes slowly, so it is
+    cached for a short TTL. The four independent stat groups are queried
+    concurrently.
+    """
+    # Take one clock reading so every time window lines up
+    now = datetime.utcnow()
+    
+    # Get user, subscription, activity and revenue statistics concurrently
+    (
+        user_stats,
+        subscription_stats,
+        activity_stats,
+        revenue_last_30_days,
+    ) = await asyncio.gather(
+        _run_in_own_session(db, get_user_statistics, now),
+        _run_in_own_session(db, get_subscription_statistics, now),
+        _run_in_own_session(db, get_user_activity_statistics, now),
+        _run_in_own_session(db, get_revenue_last_30_days, now),
+    )
     
     # For a real implementation, this would count actual platform clones
     # For now, we'll just return a placeholder
@@ -54,10 +86,14 @@ def get_admin_dashboard_stats(db: Session) -> AdminDashboardStats:
     )
 
 
-def get_user_statistics(db: Session) -> UserStatistics:
+def get_user_statistics(db: Session, now: Optional[datetime] = None) -> UserStatistics:
     """
     Get user statistics for the admin dashboard.
     """
+    now = now or datetime.utcnow()
+    thirty_days_ago = now - timedelta(days=30)
+    sixty_days_ago = now - timedelta(days=60)
+    
     # Total users
     total_users = db.query(func.count(User.id)).scalar() or 0
     
@@ -76,7 +112,6 @@ def get_user_statistics(db: Session) -> UserStatistics:
     )
     
     # New users in last 30 days
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
     new_users_last_30_days = (
         db.query(func.count(User.id))
         .filter(User.created_at >= thirty_days_ago)
@@ -84,7 +119,6 @@ def get_user_statistics(db: Session) -> UserStatistics:
     )
     
     # User growth rate (comparing last 30 days to previous 30 days)
-    sixty_days_ago = datetime.utcnow() - timedelta(days=60)
     users_30_60_days_ago = (
         db.query(func.count(User.id))
         .filter(User.created_at >= sixty_days_ago, User.created_at < thirty_days_ago)
@@ -106,10 +140,13 @@ def get_user_statistics(db: Session) -> UserStatistics:
     )
 
 
-def get_subscription_statistics(db: Session) -> SubscriptionStatistics:
+def get_subscription_statistics(db: Session, now: Optional[datetime] = None) -> SubscriptionStatistics:
     """
     Get subscription statistics for the admin dashboard.
     """
+    now = now or datetime.utcnow()
+    thirty_days_ago = now - timedelta(days=30)
+    
     # Total subscriptions
     total_subscriptions = db.query(func.count(Subscription.id)).scalar() or 0
     
@@ -141,14 +178,14 @@ def get_subscription_statistics(db: Session) -> SubscriptionStatistics:
         db.query(func.count(Subscription.id))
         .filter(
             Subscription.status == SubscriptionStatus.CANCELED,
-            Subscription.canceled_at >= (datetime.utcnow() - timedelta(days=30))
+            Subscription.canceled_at >= thirty_days_ago
         )
         .scalar() or 0
     )
     
     subscriptions_30_days_ago = (
         db.query(func.count(Subscription.id))
-        .filter(Subscription.created_at <= (datetime.utcnow() - timedelta(days=30)))
+        .filter(Subscription.created_at <= thirty_days_ago)
         .scalar() or 0
     )
     
@@ -182,10 +219,12 @@ def get_subscription_statistics(db: Session) -> SubscriptionStatistics:
     )
 
 
-def get_user_activity_statistics(db: Session) -> UserActivityStatistics:
+def get_user_activity_statistics(db: Session, now: Optional[datetime] = None) -> UserActivityStatistics:
     """
     Get user activity statistics for the admin dashboard.
     """
+    now = now or datetime.utcnow()
+    
     # Total interviews
     total_interviews = db.query(func.count(Interview.id)).scalar() or 0
     
@@ -206,7 +245,7 @@ def get_user_activity_statistics(db: Session) -> UserActivityStatistics:
     # Interviews in last 30 days
     interviews_last_30_days = (
         db.query(func.count(Interview.id))
-        .filter(Interview.created_at >= (datetime.utcnow() - timedelta(days=30)))
+        .filter(Interview.created_at >= (now - timedelta(days=30)))
         .scalar() or 0
     )
     
@@ -219,11 +258,11 @@ def get_user_activity_statistics(db: Session) -> UserActivityStatistics:
     )
 
 
-def get_revenue_last_30_days(db: Session) -> float:
+def get_revenue_last_30_days(db: Session, now: Optional[datetime] = None) -> float:
     """
     Get total revenue for the last 30 days.
     """
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+    thirty_days_ago = (now or datetime.utcnow()) - timedelta(days=30)
     
     revenue = (
         db.query(func.sum(Payment.amount))
@@ -249,19 +288,17 @@ def create_platform_clone(db: Session, clone_request: CloneRequest) -> CloneResp
     
     For this example, we'll just create an admin user and return a simulated response.
     """
-    # Create admin user
+    # Create the admin user as a superuser in a single transaction
     admin_user = create_user(
         db, 
         UserCreate(
             email=clone_request.admin_email,
             password=clone_request.admin_password,
             name="Admin"
-        )
+        ),
+        is_superuser=True,
+        commit=False
     )
-    
-    # Update user to be a superuser
-    admin_user.is_superuser = True
-    db.add(admin_user)
     db.commit()
     db.refresh(admin_user)
     
@@ -286,13 +323,20 @@ def get_admin_users(
     db: Session, 
     skip: int = 0, 
     limit: int = 100, 
-    search: Optional[str] = None
-) -> Tuple[List[User], int]:
+    search: Optional[str] = None,
+    cursor: Optional[Tuple[datetime, str]] = None
+) -> Tuple[List[UserResponse], int]:
     """
     Get users with pagination and optional search for admin panel.
     Returns a tuple of (users, total_count).
+    
+    Pass the (created_at, id) of the last user on the previous page as
+    `cursor` to page by key instead of by offset; `skip` is ignored then.
+    
+    This is a read-only path, so it selects only the UserResponse columns and
+    builds the responses directly, bypassing ORM instances and lazy loads.
     """
-    query = db.query(User)
+    query = db.query(*_USER_RESPONSE_COLUMNS)
     
     if search:
         search = f"%{search}%"
@@ -301,22 +345,52 @@ def get_admin_users(
             (User.name.ilike(search))
         )
     
-    # Get total count before pagination
-    total_count = query.count()
+    filtered_query = query
+    
+    # Keyset pagination avoids scanning and discarding `skip` rows on deep pages.
+    # The cursor filter narrows the rows a window count would see, so count first.
+    if cursor:
+        total_count = query.count()
+        query = query.filter(tuple_(User.created_at, User.id) < tuple_(*cursor))
+    else:
+        # Return the total alongside each row instead of a separate COUNT query
+        query = query.add_columns(func.count().over().label("total_count")).offset(skip)
     
     # Apply pagination and get users
-    users = query.order_by(User.created_at.desc()).offset(skip).limit(limit).all()
+    rows = (
+        query
+        .order_by(User.created_at.desc(), User.id.desc())
+        .limit(limit)
+        .all()
+    )
+    
+    # Rows come straight from the database, so skip re-validation
+    users = [
+        UserResponse.model_construct(**dict(zip(_USER_RESPONSE_FIELDS, row)))
+        for row in rows
+    ]
+    
+    if cursor:
+        return users, total_count
+    
+    if rows:
+        total_count = rows[0].total_count
+    else:
+        # An empty page carries no window total; only count if we paged past the end
+        total_count = filtered_query.count() if skip else 0
     
     return users, total_count
 
 
-def admin_update_user(
+async def admin_update_user(
     db: Session, 
     user_id: str, 
     user_update: AdminUserUpdate
 ) -> User:
     """
     Admin update of a user.
+    
+    Password hashing runs in a worker thread so bcrypt doesn't block the event loop.
     """
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -326,14 +400,14 @@ def admin_update_user(
     
     # Hash password if it's being updated
     if "password" in update_data and update_data["password"]:
-        user.hashed_password = get_password_hash(update_data.pop("password"))
+        user.hashed_password = await asyncio.to_thread(get_password_hash, update_data.pop("password"))
     
     # Update other fields
     for field, value in update_data.items():
         if hasattr(user, field):
             setattr(user, field, value)
     
-    db.add(user)
+    # `user` is already attached to the session; commit flushes the changes
     db.commit()
     db.refresh(user)
     
@@ -345,15 +419,12 @@ def admin_create_user(db: Session, user_data: UserCreate, is_superuser: bool = F
     """
     Admin creation of a user.
     """
-    # Create user
-    user = create_user(db, user_data)
+    # Create user, including the superuser flag, in a single transaction
+    user = create_user(db, user_data, is_superuser=is_superuser, commit=False)
+    db.commit()
+    db.refresh(user)
     
-    # If this should be a superuser, update that flag
     if is_superuser:
-        user.is_superuser = True
-        db.add(user)
-        db.commit()
-        db.refresh(user)
         logger.info(f"Created superuser: {user.email}")
     
     return user
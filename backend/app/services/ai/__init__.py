@@ -16,12 +16,26 @@ from .base import (
     AIModelError,
     PromptError,
     retry_on_error,
-    SimpleMemoryCache
+    cache_key_digest,
+    TokenBucket,
+    SimpleMemoryCache,
+    RedisCache
 )
 
-from .openai_service import OpenAIService, OpenAIOptions, OpenAIFeedbackTemplate
-from .mock_service import MockAIService
-from .factory import AIServiceFactory, AIProvider, default_ai_service
+import importlib
+from typing import Any
+
+# Provider modules pull in httpx and friends, so they are only imported the
+# first time one of their names is accessed (PEP 562)
+_LAZY_IMPORTS = {
+    "OpenAIService": ".openai_service",
+    "OpenAIOptions": ".openai_service",
+    "OpenAIFeedbackTemplate": ".openai_service",
+    "MockAIService": ".mock_service",
+    "AIServiceFactory": ".factory",
+    "AIProvider": ".factory",
+    "get_default_ai_service": ".factory",
+}
 
 __all__ = [
     # Base classes and utilities
@@ -35,7 +49,10 @@ __all__ = [
     "AIModelError",
     "PromptError",
     "retry_on_error",
+    "cache_key_digest",
+    "TokenBucket",
     "SimpleMemoryCache",
+    "RedisCache",
     
     # Implementation classes
     "OpenAIService",
@@ -46,5 +63,19 @@ __all__ = [
     # Factory
     "AIServiceFactory",
     "AIProvider",
-    "default_ai_service",
+    "get_default_ai_service",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
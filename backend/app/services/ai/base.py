@@ -1,11 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Tuple, Union
-from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional, List, Literal, Tuple, Union
+from pydantic import BaseModel, Field, PrivateAttr
+import asyncio
 import logging
+import re
 import time
-import json
 from functools import wraps
+from dataclasses import dataclass
+from collections import OrderedDict, deque
 import hashlib
+import heapq
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -15,17 +20,28 @@ class PromptTemplate(BaseModel):
     template: str
     variables: List[str] = Field(default_factory=list)
 
+    # Matches every {variable} placeholder in a single pass
+    _pattern: Optional[re.Pattern] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.variables:
+            self._pattern = re.compile(
+                r"\{(" + "|".join(re.escape(var) for var in self.variables) + r")\}"
+            )
+
     def format(self, **kwargs) -> str:
         """Format the template with the given variables"""
-        template = self.template
-        for var in self.variables:
-            if var in kwargs:
-                template = template.replace(f"{{{var}}}", str(kwargs[var]))
-        return template
+        if self._pattern is None:
+            return self.template
+        return self._pattern.sub(
+            lambda m: str(kwargs[m.group(1)]) if m.group(1) in kwargs else m.group(0),
+            self.template
+        )
 
 
-class AIServiceResult(BaseModel):
-    """Result model for AI service responses"""
+@dataclass(slots=True)
+class AIServiceResult:
+    """Result of an AI service call (a plain dataclass, created on every generate)"""
     content: str
     model: Optional[str] = None
     usage: Optional[Dict[str, Any]] = None
@@ -45,6 +61,8 @@ class CacheConfig(BaseModel):
     enabled: bool = True
     ttl: int = 3600  # Time to live in seconds (1 hour default)
     max_size: int = 1000  # Maximum number of cache entries
+    max_bytes: int = 64 * 1024 * 1024  # Maximum total size of cached content
+    backend: Literal["memory", "redis"] = "memory"  # "redis" shares the cache between workers
 
 
 class AIServiceError(Exception):
@@ -94,66 +112,216 @@ def retry_on_error(max_retries=3, delay=1.0, backoff=2.0,
                         raise
                     
                     logger.warning(f"Retry {retries}/{max_retries} for {func.__name__} after error: {str(e)}")
-                    time.sleep(current_delay)
+                    await asyncio.sleep(current_delay)
                     current_delay *= backoff
         return wrapper
     return decorator
 
 
+def cache_key_digest(prompt: str, model: str, **kwargs) -> bytes:
+    """Hash a prompt and its parameters into a 16-byte cache key digest"""
+    # Feed the hash incrementally so large prompts are never re-serialized
+    h = hashlib.blake2b(digest_size=16)
+    h.update(model.encode())
+    h.update(b"\0")
+    h.update(prompt.encode())
+    h.update(b"\0")
+    
+    # Include relevant parameters in the key
+    for k in sorted(kwargs):
+        if k in ('stream', 'user'):
+            continue
+        h.update(k.encode())
+        h.update(b"=")
+        h.update(repr(kwargs[k]).encode())
+        h.update(b"\0")
+    return h.digest()
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+    
+    Holds up to `capacity` tokens and refills at `rate` tokens per second,
+    allowing short bursts while enforcing the average rate. Refill and take
+    happen without awaiting, so calls from the event loop never interleave.
+    """
+    __slots__ = ("capacity", "rate", "tokens", "last_refill")
+    
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+    
+    def acquire(self, cost: float = 1, now: Optional[float] = None) -> bool:
+        """Take `cost` tokens if available"""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+
 class SimpleMemoryCache:
-    """Simple in-memory cache implementation"""
+    """Simple in-memory LRU cache implementation"""
     
-    def __init__(self, ttl: int = 3600, max_size: int = 1000):
-        self.cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, ttl: int = 3600, max_size: int = 1000, max_bytes: int = 64 * 1024 * 1024):
+        # Ordered least- to most-recently used
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.ttl = ttl
         self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._bytes = 0  # Running size of all cached content
+        # (expiry, key) min-heap used to purge expired entries as new ones arrive
+        self._expiry_heap: List[Tuple[float, str]] = []
     
-    def _generate_key(self, prompt: str, model: str, **kwargs) -> str:
-        """Generate a cache key from prompt and parameters"""
-        # Include relevant parameters in the key
-        key_data = {
-            "prompt": prompt,
-            "model": model,
-            **{k: v for k, v in kwargs.items() if k not in ['stream', 'user']}
-        }
-        key_str = json.dumps(key_data, sort_keys=True)
-        return hashlib.md5(key_str.encode()).hexdigest()
+    def _generate_key(
+        self, prompt: str, model: str, digest: Optional[bytes] = None, **kwargs
+    ) -> str:
+        """Generate a cache key from prompt and parameters, or from a precomputed digest"""
+        return (digest or cache_key_digest(prompt, model, **kwargs)).hex()
     
-    def get(self, prompt: str, model: str, **kwargs) -> Optional[AIServiceResult]:
+    def get(
+        self, prompt: str, model: str, digest: Optional[bytes] = None, **kwargs
+    ) -> Optional[AIServiceResult]:
         """Get a cached result if it exists and is not expired"""
-        key = self._generate_key(prompt, model, **kwargs)
+        key = self._generate_key(prompt, model, digest, **kwargs)
         
         if key in self.cache:
             entry = self.cache[key]
-            if time.time() < entry["expiry"]:
+            if time.monotonic() < entry["expiry"]:
                 logger.debug(f"Cache hit for key: {key[:8]}...")
+                self.cache.move_to_end(key)
                 return entry["result"]
             else:
                 # Remove expired entry
                 logger.debug(f"Removing expired cache entry: {key[:8]}...")
                 del self.cache[key]
+                self._bytes -= entry["size"]
         
         return None
     
-    def set(self, prompt: str, model: str, result: AIServiceResult, **kwargs) -> None:
+    def set(
+        self, prompt: str, model: str, result: AIServiceResult,
+        digest: Optional[bytes] = None, **kwargs
+    ) -> None:
         """Store a result in the cache"""
-        key = self._generate_key(prompt, model, **kwargs)
+        key = self._generate_key(prompt, model, digest, **kwargs)
+        size = len(result.content)
+        now = time.monotonic()
+        expiry = now + self.ttl
+        
+        self._purge_expired(now)
         
-        # Enforce cache size limit
-        if len(self.cache) >= self.max_size:
-            # Remove oldest entry
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k]["expiry"])
-            del self.cache[oldest_key]
+        previous = self.cache.pop(key, None)
+        if previous:
+            self._bytes -= previous["size"]
         
         self.cache[key] = {
             "result": result,
-            "expiry": time.time() + self.ttl
+            "expiry": expiry,
+            "size": size
         }
+        self._bytes += size
+        heapq.heappush(self._expiry_heap, (expiry, key))
+        
+        # Enforce cache size limits by evicting the least recently used entries
+        while len(self.cache) > self.max_size or self._bytes > self.max_bytes:
+            _, evicted = self.cache.popitem(last=False)
+            self._bytes -= evicted["size"]
         logger.debug(f"Cached result for key: {key[:8]}...")
     
+    def _purge_expired(self, now: float) -> None:
+        """Drop entries whose TTL has passed, oldest expiry first"""
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expiry, key = heapq.heappop(self._expiry_heap)
+            entry = self.cache.get(key)
+            # Skip heap items left behind by entries that were since replaced or evicted
+            if entry and entry["expiry"] == expiry:
+                del self.cache[key]
+                self._bytes -= entry["size"]
+        
+        # Rebuild once stale heap items outnumber live entries
+        if len(self._expiry_heap) > 2 * len(self.cache) + 16:
+            self._expiry_heap = [(entry["expiry"], key) for key, entry in self.cache.items()]
+            heapq.heapify(self._expiry_heap)
+    
     def clear(self) -> None:
         """Clear all cached entries"""
         self.cache.clear()
+        self._bytes = 0
+        self._expiry_heap.clear()
+        logger.debug("Cache cleared")
+
+
+class RedisCache:
+    """
+    Redis-backed cache shared by every worker process.
+    
+    Talks to Redis through the asyncio client so lookups never block the
+    event loop. While Redis is unreachable every lookup is a miss.
+    """
+    
+    KEY_PREFIX = "ai:cache:"
+    
+    def __init__(self, ttl: int = 3600):
+        self.ttl = ttl
+        self._client = None
+    
+    def _get_client(self):
+        """Get the asyncio Redis client, creating it on first use"""
+        if self._client is None:
+            import redis.asyncio as redis_asyncio
+            from app.core.config import settings
+            
+            self._client = redis_asyncio.from_url(settings.REDIS_URL)
+        return self._client
+    
+    def _generate_key(
+        self, prompt: str, model: str, digest: Optional[bytes] = None, **kwargs
+    ) -> str:
+        """Generate a cache key from prompt and parameters, or from a precomputed digest"""
+        return self.KEY_PREFIX + (digest or cache_key_digest(prompt, model, **kwargs)).hex()
+    
+    async def get(
+        self, prompt: str, model: str, digest: Optional[bytes] = None, **kwargs
+    ) -> Optional[AIServiceResult]:
+        """Get a cached result if it exists and is not expired"""
+        key = self._generate_key(prompt, model, digest, **kwargs)
+        try:
+            raw = await self._get_client().get(key)
+        except Exception as e:
+            logger.debug(f"AI cache read failed for {key}: {str(e)}")
+            return None
+        if raw is None:
+            return None
+        try:
+            return AIServiceResult(**orjson.loads(raw))
+        except Exception as e:
+            logger.warning(f"Discarding unreadable AI cache entry: {str(e)}")
+            return None
+    
+    async def set(
+        self, prompt: str, model: str, result: AIServiceResult,
+        digest: Optional[bytes] = None, **kwargs
+    ) -> None:
+        """Store a result in the cache"""
+        key = self._generate_key(prompt, model, digest, **kwargs)
+        try:
+            # orjson serializes dataclasses natively
+            await self._get_client().setex(key, self.ttl, orjson.dumps(result))
+        except Exception as e:
+            logger.debug(f"AI cache write failed for {key}: {str(e)}")
+    
+    def clear(self) -> None:
+        """Clear all cached entries"""
+        from app.core.cache import invalidate_cache_prefix
+        
+        invalidate_cache_prefix(self.KEY_PREFIX)
         logger.debug("Cache cleared")
 
 
@@ -173,15 +341,23 @@ class BaseAIService(ABC):
         self.rate_limit = rate_limit or RateLimitConfig()
         self.cache_config = cache_config or CacheConfig()
         
-        # Rate limiting state
-        self._request_timestamps: List[float] = []
+        # Rate limiting state: request times within the last day, plus a
+        # token bucket that refills to the per-minute limit once a minute
+        self._request_timestamps: "deque[float]" = deque()
+        self._minute_bucket = TokenBucket(
+            capacity=self.rate_limit.requests_per_minute,
+            rate=self.rate_limit.requests_per_minute / 60
+        )
         
         # Initialize cache if enabled
         self._cache = None
-        if self.cache_config.enabled:
+        if self.cache_config.enabled and self.cache_config.backend == "redis":
+            self._cache = RedisCache(ttl=self.cache_config.ttl)
+        elif self.cache_config.enabled:
             self._cache = SimpleMemoryCache(
                 ttl=self.cache_config.ttl,
-                max_size=self.cache_config.max_size
+                max_size=self.cache_config.max_size,
+                max_bytes=self.cache_config.max_bytes
             )
     
     def _check_rate_limit(self) -> Tuple[bool, str]:
@@ -191,35 +367,40 @@ class BaseAIService(ABC):
         Returns:
             Tuple of (is_allowed, reason)
         """
-        now = time.time()
+        now = time.monotonic()
         
-        # Remove timestamps older than a day
+        # Drop timestamps that have left the daily window (the deque is in time order)
         day_ago = now - 86400  # 24 hours in seconds
-        self._request_timestamps = [ts for ts in self._request_timestamps if ts > day_ago]
+        while self._request_timestamps and self._request_timestamps[0] <= day_ago:
+            self._request_timestamps.popleft()
         
         # Check daily limit
         if len(self._request_timestamps) >= self.rate_limit.requests_per_day:
             return False, "Daily rate limit exceeded"
         
         # Check per-minute limit
-        minute_ago = now - 60
-        recent_requests = sum(1 for ts in self._request_timestamps if ts > minute_ago)
-        if recent_requests >= self.rate_limit.requests_per_minute:
+        if not self._minute_bucket.acquire(now=now):
             return False, "Per-minute rate limit exceeded"
         
         # Request is allowed, add timestamp
         self._request_timestamps.append(now)
         return True, ""
     
-    def _get_from_cache(self, prompt: str, model: str, **kwargs) -> Optional[AIServiceResult]:
+    async def _get_from_cache(self, prompt: str, model: str, **kwargs) -> Optional[AIServiceResult]:
         """Try to get a result from cache if enabled"""
-        if self._cache and not kwargs.get("skip_cache", False):
-            return self._cache.get(prompt, model, **kwargs)
-        return None
+        if not self._cache or kwargs.get("skip_cache", False):
+            return None
+        if isinstance(self._cache, RedisCache):
+            return await self._cache.get(prompt, model, **kwargs)
+        return self._cache.get(prompt, model, **kwargs)
     
-    def _set_cache(self, prompt: str, model: str, result: AIServiceResult, **kwargs) -> None:
+    async def _set_cache(self, prompt: str, model: str, result: AIServiceResult, **kwargs) -> None:
         """Add a result to cache if enabled"""
-        if self._cache and not kwargs.get("skip_cache", False):
+        if not self._cache or kwargs.get("skip_cache", False):
+            return
+        if isinstance(self._cache, RedisCache):
+            await self._cache.set(prompt, model, result, **kwargs)
+        else:
             self._cache.set(prompt, model, result, **kwargs)
     
     @abstractmethod
@@ -282,3 +463,7 @@ class BaseAIService(ABC):
     def clear_cache(self) -> None:
         """Clear the response cache"""
         pass
+    
+    async def aclose(self) -> None:
+        """Release any network resources held by the service"""
+        pass
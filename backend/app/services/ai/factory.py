@@ -1,4 +1,5 @@
 from typing import Optional, Dict, Any, Union
+import functools
 import os
 import logging
 from enum import Enum
@@ -65,7 +66,7 @@ class AIServiceFactory:
             
             if not api_key:
                 logger.warning("No OpenAI API key found. Falling back to mock service.")
-                return MockAIService(rate_limit=rate_limit, cache_config=cache_config)
+                return MockAIService(rate_limit=rate_limit)
             
             # Create OpenAI options if provided
             openai_options = None
@@ -80,7 +81,7 @@ class AIServiceFactory:
             )
             
         elif provider == AIProvider.MOCK:
-            # Create mock service
+            # Create mock service (uncached, its responses are cheap to regenerate)
             dictionary_path = service_options.get("dictionary_path")
             latency = service_options.get("latency", (0.2, 1.5))
             error_rate = service_options.get("error_rate", 0.05)
@@ -88,29 +89,31 @@ class AIServiceFactory:
             return MockAIService(
                 dictionary_path=dictionary_path,
                 rate_limit=rate_limit,
-                cache_config=cache_config,
                 latency=latency,
                 error_rate=error_rate
             )
         
         # Default to mock if we somehow get here
         logger.warning(f"Unhandled provider: {provider}. Using mock service.")
-        return MockAIService(rate_limit=rate_limit, cache_config=cache_config)
+        return MockAIService(rate_limit=rate_limit)
 
 
-# Default instance configured from settings
-default_ai_service = AIServiceFactory.create_service(
-    provider=settings.AI_PROVIDER,
-    api_key=settings.OPENAI_API_KEY,
-    rate_limit=RateLimitConfig(
-        requests_per_minute=settings.AI_RATE_LIMIT_REQUESTS_PER_MINUTE,
-        requests_per_day=settings.AI_RATE_LIMIT_REQUESTS_PER_DAY
-    ),
-    cache_config=CacheConfig(
-        enabled=settings.AI_CACHE_ENABLED,
-        ttl=settings.AI_CACHE_TTL
-    ),
-    service_options={
-        "model": settings.OPENAI_MODEL
-    }
-)
+@functools.lru_cache(maxsize=1)
+def get_default_ai_service() -> BaseAIService:
+    """Get the default service instance configured from settings, built on first use"""
+    return AIServiceFactory.create_service(
+        provider=settings.AI_PROVIDER,
+        api_key=settings.OPENAI_API_KEY,
+        rate_limit=RateLimitConfig(
+            requests_per_minute=settings.AI_RATE_LIMIT_REQUESTS_PER_MINUTE,
+            requests_per_day=settings.AI_RATE_LIMIT_REQUESTS_PER_DAY
+        ),
+        cache_config=CacheConfig(
+            enabled=settings.AI_CACHE_ENABLED,
+            ttl=settings.AI_CACHE_TTL,
+            backend=settings.AI_CACHE_BACKEND
+        ),
+        service_options={
+            "model": settings.OPENAI_MODEL
+        }
+    )
@@ -1,9 +1,11 @@
 import os
 import json
 import logging
-from typing import Dict, Any, Optional, List, Tuple, Union, Literal
-from pydantic import BaseModel, Field
+import orjson
+from typing import Dict, Any, AsyncIterator, Optional, List, Tuple, Union, Literal
+from pydantic import BaseModel, ConfigDict, Field
 import time
+import hashlib
 import httpx
 import asyncio
 
@@ -24,8 +26,18 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 
+# Request options that _prepare_payload resolves against OpenAIOptions
+_PAYLOAD_OPTION_KEYS = (
+    "model", "temperature", "max_tokens", "top_p", "frequency_penalty",
+    "presence_penalty", "stop", "response_format", "seed", "n"
+)
+
+
 class OpenAIOptions(BaseModel):
     """Configuration options for OpenAI API"""
+    # Immutable, so payloads prepared from it can be reused
+    model_config = ConfigDict(frozen=True)
+    
     model: str = "gpt-4"  # Model to use (gpt-4, gpt-3.5-turbo, etc.)
     temperature: float = Field(0.7, ge=0.0, le=2.0)  # Controls randomness
     max_tokens: Optional[int] = None  # Max tokens to generate
@@ -39,6 +51,41 @@ class OpenAIOptions(BaseModel):
     stream: bool = False  # Stream tokens as they're generated
 
 
+class OpenAIMessage(BaseModel):
+    """Message returned in a chat completion choice"""
+    model_config = ConfigDict(extra="ignore")
+    
+    role: Optional[str] = None
+    content: Optional[str] = None
+
+
+class OpenAIChoice(BaseModel):
+    """Single chat completion choice"""
+    model_config = ConfigDict(extra="ignore")
+    
+    message: OpenAIMessage
+    finish_reason: Optional[str] = None
+
+
+class OpenAIUsage(BaseModel):
+    """Token usage reported for a chat completion"""
+    model_config = ConfigDict(extra="ignore")
+    
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+
+class OpenAIChatResponse(BaseModel):
+    """The parts of a chat completion response that the service reads"""
+    model_config = ConfigDict(extra="ignore")
+    
+    id: Optional[str] = None
+    created: Optional[int] = None
+    choices: List[OpenAIChoice]
+    usage: Optional[OpenAIUsage] = None
+
+
 class OpenAIFeedbackTemplate(PromptTemplate):
     """Template for generating interview feedback"""
     
@@ -117,6 +164,13 @@ Format your response as a JSON object with the following structure:
         super().__init__(template=template, variables=variables)
 
 
+# Feedback templates are immutable, so build each one once and share it
+_FEEDBACK_TEMPLATES = {
+    template_type: OpenAIFeedbackTemplate(template_type=template_type)
+    for template_type in ("general", "technical", "behavioral")
+}
+
+
 class OpenAIService(BaseAIService):
     """
     OpenAI implementation of the AI service.
@@ -136,6 +190,18 @@ class OpenAIService(BaseAIService):
         super().__init__(api_key, rate_limit, cache_config)
         self.options = options or OpenAIOptions()
         
+        # Prepared payloads minus the messages, keyed on the option overrides used
+        self._payload_skeletons: Dict[Tuple[Tuple[str, str], ...], Dict[str, Any]] = {}
+        self._feedback_payload_skeleton: Optional[Dict[str, Any]] = None
+        
+        # Shared HTTP client so connections to the API are kept alive between requests
+        self._client: Optional[httpx.AsyncClient] = None
+        self._headers: Dict[str, str] = {}
+        
+        # Futures for requests currently awaiting a response, keyed on cache digest
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        self._headers_api_key: Optional[str] = None
+        
         # Use API key from settings or environment if not provided
         if not self.api_key:
             self.api_key = settings.OPENAI_API_KEY or os.environ.get("OPENAI_API_KEY")
@@ -164,22 +230,61 @@ class OpenAIService(BaseAIService):
         if self._cache:
             self._cache.clear()
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=60.0,
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     def _prepare_headers(self) -> Dict[str, str]:
         """Prepare HTTP headers for OpenAI API"""
         if not self.api_key:
             raise AIServiceError("OpenAI API key is required")
         
-        return {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        # Built once per API key, since they are the same for every request
+        if self._headers_api_key != self.api_key:
+            self._headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+            self._headers_api_key = self.api_key
+        return self._headers
     
     def _prepare_payload(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """Prepare payload for OpenAI API request"""
+        # Everything but the messages depends only on the option overrides,
+        # so build that part once per distinct set of overrides
+        option_kwargs = {key: kwargs.pop(key) for key in _PAYLOAD_OPTION_KEYS if key in kwargs}
+        skeleton_key = tuple((key, repr(value)) for key, value in option_kwargs.items())
+        
+        skeleton = self._payload_skeletons.get(skeleton_key)
+        if skeleton is None:
+            skeleton = self._build_payload_skeleton(**option_kwargs)
+            self._payload_skeletons[skeleton_key] = skeleton
+        
+        payload = {**skeleton, "messages": messages}
+        
+        # Add any remaining kwargs as-is
+        for key, value in kwargs.items():
+            if key not in payload:
+                payload[key] = value
+                
+        return payload
+    
+    def _build_payload_skeleton(self, **kwargs) -> Dict[str, Any]:
+        """Build the message-independent part of a request payload"""
         # Start with default options
         payload = {
             "model": kwargs.pop("model", self.options.model),
-            "messages": messages,
             "temperature": kwargs.pop("temperature", self.options.temperature),
         }
         
@@ -211,15 +316,44 @@ class OpenAIService(BaseAIService):
         # Stream is False by default since we don't handle streaming here
         payload["stream"] = False
         
-        # Add any remaining kwargs as-is
+        # Keep option overrides that matched the defaults
         for key, value in kwargs.items():
             if key not in payload:
                 payload[key] = value
                 
         return payload
     
-    async def _make_request(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
-        """Make a request to the OpenAI API"""
+    def _cache_digest(self, payload: Dict[str, Any]) -> bytes:
+        """Hash a prepared payload into a 16-byte cache key"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(orjson.dumps(
+            {k: v for k, v in payload.items() if k not in ("messages", "stream", "user")},
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        ))
+        for message in payload["messages"]:
+            h.update(b"\0")
+            h.update(message["role"].encode())
+            h.update(b":")
+            h.update(message["content"].encode())
+        return h.digest()
+    
+    def _prepare_feedback_payload(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Prepare the payload for a feedback request that has no option overrides"""
+        if self._feedback_payload_skeleton is None:
+            self._feedback_payload_skeleton = self._build_payload_skeleton(
+                temperature=0.3,  # Lower temperature for consistency
+                response_format={"type": "json_object"}
+            )
+        return {**self._feedback_payload_skeleton, "messages": messages}
+    
+    async def _make_request(
+        self,
+        messages: List[Dict[str, str]],
+        _payload: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Make a request to the OpenAI API, optionally with an already prepared payload"""
         # Check rate limit before making request
         allowed, reason = self._check_rate_limit()
         if not allowed:
@@ -228,61 +362,152 @@ class OpenAIService(BaseAIService):
         # Prepare request
         url = self.API_URL
         headers = self._prepare_headers()
-        payload = self._prepare_payload(messages, **kwargs)
+        payload = _payload if _payload is not None else self._prepare_payload(messages, **kwargs)
         
         # Get model for caching purposes
         model = payload.get("model", self.default_model)
         
-        # Format prompt for caching purposes
-        # We join all user messages to create a cache key
-        prompt = "\n".join([m["content"] for m in messages if m["role"] == "user"])
+        # Hash the request for caching purposes, without joining the messages
+        cache_digest = self._cache_digest(payload)
         
         # Try to get from cache
-        cached_result = self._get_from_cache(prompt, model, **kwargs)
+        cached_result = await self._get_from_cache("", model, digest=cache_digest, **kwargs)
         if cached_result:
             return cached_result
         
+        # Share the response of an identical request that is already in flight.
+        # The request runs as its own task, so a caller that is cancelled (e.g.
+        # a disconnected client) doesn't cancel it for the callers sharing it.
+        inflight = self._inflight.get(cache_digest)
+        if inflight is None:
+            inflight = asyncio.ensure_future(
+                self._send_and_cache(url, headers, payload, model, cache_digest, **kwargs)
+            )
+            self._inflight[cache_digest] = inflight
+            inflight.add_done_callback(
+                lambda task: self._finish_inflight(cache_digest, task)
+            )
+        
+        return await asyncio.shield(inflight)
+    
+    async def _send_and_cache(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        model: str,
+        cache_digest: bytes,
+        **kwargs
+    ) -> AIServiceResult:
+        """Send a request and cache its result"""
+        result = await self._send_request(url, headers, payload, model)
+        await self._set_cache("", model, result, digest=cache_digest, **kwargs)
+        return result
+    
+    def _finish_inflight(self, cache_digest: bytes, task: "asyncio.Future") -> None:
+        """Forget a finished in-flight request"""
+        if self._inflight.get(cache_digest) is task:
+            del self._inflight[cache_digest]
+        # Mark failures as retrieved even when nobody was left waiting on them
+        if not task.cancelled():
+            task.exception()
+    
+    async def _send_request(
+        self, url: str, headers: Dict[str, str], payload: Dict[str, Any], model: str
+    ) -> AIServiceResult:
+        """Send a prepared request to the OpenAI API and parse the response"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    json=payload,
-                    timeout=60.0
-                )
+            response = await self._get_client().post(
+                url,
+                headers=headers,
+                content=orjson.dumps(payload)
+            )
+            
+            if response.status_code == 429:
+                raise RateLimitExceededError("OpenAI API rate limit exceeded")
                 
+            if response.status_code != 200:
+                error_msg = f"OpenAI API error: {response.status_code} - {response.text}"
+                logger.error(error_msg)
+                raise AIModelError(error_msg)
+            
+            # Parse and validate the response in a single pass
+            response_data = OpenAIChatResponse.model_validate_json(response.content)
+            if not response_data.choices:
+                raise AIModelError("OpenAI API returned no choices")
+            
+            choice = response_data.choices[0]
+            content = choice.message.content or ""
+            usage = response_data.usage.model_dump() if response_data.usage else {}
+            
+            # Create the result
+            result = AIServiceResult(
+                content=content,
+                model=model,
+                usage=usage,
+                metadata={
+                    "provider": "openai",
+                    "finish_reason": choice.finish_reason,
+                    "created": response_data.created,
+                    "id": response_data.id
+                }
+            )
+            
+            return result
+            
+        except httpx.TimeoutException:
+            raise AIModelError("Request to OpenAI API timed out")
+        except httpx.RequestError as e:
+            raise AIModelError(f"Request to OpenAI API failed: {str(e)}")
+        except Exception as e:
+            if isinstance(e, AIServiceError):
+                raise
+            else:
+                raise AIModelError(f"Unexpected error: {str(e)}")
+    
+    async def _make_request_stream(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> AsyncIterator[str]:
+        """Make a streaming request to the OpenAI API, yielding content as it arrives"""
+        # Check rate limit before making request
+        allowed, reason = self._check_rate_limit()
+        if not allowed:
+            raise RateLimitExceededError(f"Rate limit exceeded: {reason}")
+        
+        headers = self._prepare_headers()
+        payload = self._prepare_payload(messages, **kwargs)
+        payload["stream"] = True
+        
+        try:
+            async with self._get_client().stream(
+                "POST",
+                self.API_URL,
+                headers=headers,
+                content=orjson.dumps(payload)
+            ) as response:
                 if response.status_code == 429:
                     raise RateLimitExceededError("OpenAI API rate limit exceeded")
-                    
+                
                 if response.status_code != 200:
-                    error_msg = f"OpenAI API error: {response.status_code} - {response.text}"
+                    body = await response.aread()
+                    error_msg = f"OpenAI API error: {response.status_code} - {body.decode(errors='replace')}"
                     logger.error(error_msg)
                     raise AIModelError(error_msg)
                 
-                response_data = response.json()
-                
-                # Parse the response
-                content = response_data["choices"][0]["message"]["content"]
-                usage = response_data.get("usage", {})
-                
-                # Create the result
-                result = AIServiceResult(
-                    content=content,
-                    model=model,
-                    usage=usage,
-                    metadata={
-                        "provider": "openai",
-                        "finish_reason": response_data["choices"][0].get("finish_reason"),
-                        "created": response_data.get("created"),
-                        "id": response_data.get("id")
-                    }
-                )
-                
-                # Cache the result
-                self._set_cache(prompt, model, result, **kwargs)
-                
-                return result
-                
+                # Server-sent events: one "data: {...}" line per chunk, then "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[6:]
+                    if data == "[DONE]":
+                        break
+                    
+                    choices = orjson.loads(data).get("choices")
+                    if choices:
+                        content = choices[0].get("delta", {}).get("content")
+                        if content:
+                            yield content
+                            
         except httpx.TimeoutException:
             raise AIModelError("Request to OpenAI API timed out")
         except httpx.RequestError as e:
@@ -293,6 +518,35 @@ class OpenAIService(BaseAIService):
             else:
                 raise AIModelError(f"Unexpected error: {str(e)}")
     
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream content generated from a prompt using OpenAI API
+        
+        Responses are not cached or retried, since chunks are handed to the
+        caller as soon as they arrive.
+        
+        Args:
+            prompt: Text prompt to generate from
+            **kwargs: Additional OpenAI-specific options
+            
+        Yields:
+            Pieces of the generated content in order
+        """
+        system_prompt = kwargs.pop("system_prompt", 
+                                   "You are a helpful AI assistant that provides clear and concise responses.")
+        
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+        
+        # Set JSON response format by default (can be overridden)
+        if "response_format" not in kwargs:
+            kwargs["response_format"] = {"type": "json_object"}
+        
+        async for chunk in self._make_request_stream(messages, **kwargs):
+            yield chunk
+    
     @retry_on_error(max_retries=3, delay=1.0, backoff=2.0)
     async def generate(self, prompt: str, **kwargs) -> AIServiceResult:
         """
@@ -348,6 +602,10 @@ class OpenAIService(BaseAIService):
             # It's already a PromptTemplate
             formatted_prompt = template.format(**kwargs)
             
+            # Template variables are not API options
+            for var in template.variables:
+                kwargs.pop(var, None)
+            
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": formatted_prompt}
@@ -378,19 +636,33 @@ class OpenAIService(BaseAIService):
         Returns:
             AIServiceResult with the generated feedback as JSON
         """
-        # Create feedback template
-        template = OpenAIFeedbackTemplate(template_type=feedback_type)
+        # Look up the feedback template (anything unknown gets the general one)
+        template = _FEEDBACK_TEMPLATES.get(feedback_type, _FEEDBACK_TEMPLATES["general"])
         
         # Set specific system prompt for feedback
         system_prompt = "You are an expert interview coach evaluating interview answers. Provide specific, constructive feedback."
         
+        # Fill in the template directly, so the variables never mix with the API options
+        prompt = template.format(question=question, answer=answer)
+        
+        # Common case: no overrides, so use the prepared feedback payload
+        if not kwargs:
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ]
+            return await self._make_feedback_request(messages)
+        
         # Override with feedback-specific options
         kwargs.update({
-            "question": question,
-            "answer": answer,
             "system_prompt": system_prompt,
             "temperature": kwargs.get("temperature", 0.3),  # Lower temperature for consistency
             "response_format": {"type": "json_object"}
         })
         
-        return await self.generate_with_template(template, **kwargs)
+        return await self.generate(prompt, **kwargs)
+    
+    @retry_on_error(max_retries=3, delay=1.0, backoff=2.0)
+    async def _make_feedback_request(self, messages: List[Dict[str, str]]) -> AIServiceResult:
+        """Send a feedback request built from the prepared feedback payload"""
+        return await self._make_request(messages, _payload=self._prepare_feedback_payload(messages))
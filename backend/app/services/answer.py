@@ -1,12 +1,16 @@
 from typing import Optional, List, Dict, Any, Union
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, desc, exists, extract, insert, tuple_, update
+import asyncio
 import logging
 import os
-import json
+import re
+import tempfile
 from datetime import datetime
-from app.services.transcription import default_transcription_service
-from app.services.ai import default_ai_service
+from uuid import uuid4
+from app.services import audio_utils
+from app.services.transcription import default_transcription_service, TranscriptionResult
+from app.services.feedback_cache import feedback_cache_key, get_cached_feedback, store_feedback
 
 from typing import Optional, List, Dict, Any, Union
 from sqlalchemy.orm import Session
@@ -19,6 +23,18 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Recordings longer than this (in seconds) are transcribed in parallel segments
+SEGMENTED_TRANSCRIPTION_THRESHOLD = 60.0
+TRANSCRIPTION_SEGMENT_DURATION = 30.0
+TRANSCRIPTION_CONCURRENCY = 8
+
+# Columns update_answer may set
+_ANSWER_COLUMNS = frozenset(Answer.__table__.columns.keys())
+
+# Question category keywords used to pick a feedback type
+_TECHNICAL_CATEGORY_RE = re.compile(r"coding|technical|system design|algorithm", re.IGNORECASE)
+_BEHAVIORAL_CATEGORY_RE = re.compile(r"behavioral|leadership|teamwork", re.IGNORECASE)
+
 
 def get_answer_by_id(db: Session, id: str) -> Optional[Answer]:
     """
@@ -38,7 +54,12 @@ def get_answers(
     """
     Get answers with optional filtering.
     """
-    query = db.query(Answer)
+    # Both relationships are many-to-one, so join them into the same query
+    # rather than lazy-loading (or batch-loading) them per answer
+    query = db.query(Answer).options(
+        joinedload(Answer.question),
+        joinedload(Answer.interview)
+    )
     
     if user_id:
         query = query.join(Interview, Answer.interview_id == Interview.id).filter(Interview.user_id == user_id)
@@ -58,37 +79,83 @@ def get_answers(
 def create_answer(db: Session, obj_in: AnswerCreate) -> Answer:
     """
     Create a new answer.
+    
+    The returned answer is detached from the session with all of its columns
+    loaded; its relationships are not.
     """
     # Verify the question exists and belongs to the specified interview
-    question = (
-        db.query(Question)
-        .filter(
+    question_exists = db.query(
+        exists().where(
             Question.id == obj_in.question_id,
             Question.interview_id == obj_in.interview_id
         )
-        .first()
-    )
+    ).scalar()
     
-    if not question:
+    if not question_exists:
         raise ValueError(f"Question with ID {obj_in.question_id} not found in interview {obj_in.interview_id}")
     
-    # Create new answer
-    db_obj = Answer(
-        content=obj_in.content,
-        audio_url=obj_in.audio_url,
-        duration=obj_in.duration,
-        interview_id=obj_in.interview_id,
-        question_id=obj_in.question_id,
-    )
+    # Insert and read back the generated columns (id, timestamps) in one round trip
+    db_obj = db.scalars(
+        insert(Answer).returning(Answer),
+        [
+            {
+                "content": obj_in.content,
+                "audio_url": obj_in.audio_url,
+                "duration": obj_in.duration,
+                "interview_id": obj_in.interview_id,
+                "question_id": obj_in.question_id,
+            }
+        ]
+    ).one()
     
-    db.add(db_obj)
+    # Detach before committing so the loaded columns aren't expired and re-selected
+    db.expunge(db_obj)
     db.commit()
-    db.refresh(db_obj)
     
     logger.info(f"Created new answer: {db_obj.id}")
     return db_obj
 
 
+def create_answers_bulk(db: Session, objs_in: List[AnswerCreate]) -> List[str]:
+    """
+    Create several answers in one INSERT and one commit.
+    
+    Returns:
+        IDs of the created answers, in the order given
+    """
+    if not objs_in:
+        return []
+    
+    # Verify every question exists and belongs to its interview in one query
+    pairs = {(obj_in.question_id, obj_in.interview_id) for obj_in in objs_in}
+    found = set(
+        db.query(Question.id, Question.interview_id)
+        .filter(tuple_(Question.id, Question.interview_id).in_(pairs))
+        .all()
+    )
+    missing = pairs - found
+    if missing:
+        question_id, interview_id = next(iter(missing))
+        raise ValueError(f"Question with ID {question_id} not found in interview {interview_id}")
+    
+    rows = [
+        {
+            "id": str(uuid4()),
+            "content": obj_in.content,
+            "audio_url": obj_in.audio_url,
+            "duration": obj_in.duration,
+            "interview_id": obj_in.interview_id,
+            "question_id": obj_in.question_id,
+        }
+        for obj_in in objs_in
+    ]
+    db.execute(insert(Answer), rows)
+    db.commit()
+    
+    logger.info(f"Created {len(rows)} answers")
+    return [row["id"] for row in rows]
+
+
 def update_answer(
     db: Session, 
     db_obj: Answer, 
@@ -96,36 +163,57 @@ def update_answer(
 ) -> Answer:
     """
     Update an answer.
+    
+    The returned answer is detached from the session with all of its
+    columns loaded; its relationships are not.
     """
     if isinstance(obj_in, dict):
         update_data = obj_in
     else:
         update_data = obj_in.model_dump(exclude_unset=True)
     
-    # Update answer with new data
-    for field in update_data:
-        if hasattr(db_obj, field):
-            setattr(db_obj, field, update_data[field])
+    values = {field: value for field, value in update_data.items() if field in _ANSWER_COLUMNS}
+    if not values:
+        return db_obj
     
-    db.add(db_obj)
+    # Update answer with new data in one UPDATE, reading the row back
+    db_obj = db.scalars(
+        update(Answer)
+        .where(Answer.id == db_obj.id)
+        .values(**values)
+        .returning(Answer)
+    ).one()
+    
+    # Detach before committing so the loaded columns aren't expired and re-selected
+    db.expunge(db_obj)
     db.commit()
-    db.refresh(db_obj)
     
     logger.info(f"Updated answer: {db_obj.id}")
     return db_obj
 
 
-def delete_answer(db: Session, db_obj: Answer) -> Answer:
+def _unlink_if_present(path: str) -> bool:
+    """
+    Remove a file, returning whether it existed.
+    """
+    try:
+        os.unlink(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+async def delete_answer(db: Session, db_obj: Answer) -> Answer:
     """
     Delete an answer.
     """
     answer_id = db_obj.id
     
-    # Delete associated audio file if it exists
-    if db_obj.audio_url and os.path.exists(db_obj.audio_url):
+    # Delete associated audio file if it exists, off the event loop
+    if db_obj.audio_url:
         try:
-            os.remove(db_obj.audio_url)
-            logger.info(f"Deleted audio file for answer {answer_id}")
+            if await asyncio.to_thread(_unlink_if_present, db_obj.audio_url):
+                logger.info(f"Deleted audio file for answer {answer_id}")
         except Exception as e:
             logger.error(f"Failed to delete audio file: {str(e)}")
     
@@ -136,6 +224,37 @@ def delete_answer(db: Session, db_obj: Answer) -> Answer:
     return db_obj
 
 
+def _resolve_feedback_type(answer: Answer, feedback_type: Optional[str]) -> Optional[str]:
+    """
+    Determine feedback type based on question category if not specified.
+    """
+    if not feedback_type and answer.question.category:
+        category = answer.question.category
+        if _TECHNICAL_CATEGORY_RE.search(category):
+            return "technical"
+        elif _BEHAVIORAL_CATEGORY_RE.search(category):
+            return "behavioral"
+        else:
+            return "general"
+    return feedback_type
+
+
+def _load_answer_with_question(db: Session, answer_id: str) -> Optional[Answer]:
+    """
+    Load an answer and its question in a short-lived session on the same engine.
+    
+    The caller's session is left untouched, and no pooled connection is held
+    while the AI service is working.
+    """
+    with Session(bind=db.get_bind()) as read_db:
+        return (
+            read_db.query(Answer)
+            .options(joinedload(Answer.question))
+            .filter(Answer.id == answer_id)
+            .first()
+        )
+
+
 async def generate_feedback(
     db: Session, 
     answer_id: str,
@@ -152,13 +271,8 @@ async def generate_feedback(
     Returns:
         AnswerFeedback object or None if generation failed
     """
-    # Get the answer with associated question
-    answer = (
-        db.query(Answer)
-        .join(Question, Answer.question_id == Question.id)
-        .filter(Answer.id == answer_id)
-        .first()
-    )
+    # Get the answer with associated question, off the event loop
+    answer = await asyncio.to_thread(_load_answer_with_question, db, answer_id)
     
     if not answer:
         logger.error(f"Answer with ID {answer_id} not found")
@@ -168,43 +282,44 @@ async def generate_feedback(
         logger.error(f"Answer {answer_id} has no content to evaluate")
         return None
     
+    # Keep what the AI call needs
+    question_content = answer.question.content
+    answer_content = answer.content
+    feedback_type = _resolve_feedback_type(answer, feedback_type)
+    cache_key = feedback_cache_key(answer.question_id, feedback_type, answer_content)
+    
     try:
-        # Determine feedback type based on question category if not specified
-        if not feedback_type and answer.question.category:
-            category = answer.question.category.lower()
-            if any(tech_keyword in category for tech_keyword in ["coding", "technical", "system design", "algorithm"]):
-                feedback_type = "technical"
-            elif any(beh_keyword in category for beh_keyword in ["behavioral", "leadership", "teamwork"]):
-                feedback_type = "behavioral"
-            else:
-                feedback_type = "general"
-        
-        # Use the AI service to generate feedback
-        result = await default_ai_service.generate_feedback(
-            question=answer.question.content,
-            answer=answer.content,
-            feedback_type=feedback_type
-        )
-        
-        # Parse response
-        feedback_data = json.loads(result.content)
+        # Reuse feedback already generated for the same answer to this question
+        feedback = await asyncio.to_thread(get_cached_feedback, cache_key)
+        result = None
+        if feedback is None:
+            # Use the AI service to generate feedback (imported here so the
+            # provider modules load on first use)
+            from app.services.ai import get_default_ai_service
+            
+            result = await get_default_ai_service().generate_feedback(
+                question=question_content,
+                answer=answer_content,
+                feedback_type=feedback_type
+            )
+            
+            # Parse and validate the response in a single pass
+            feedback = AnswerFeedback.model_validate_json(result.content)
+            await asyncio.to_thread(store_feedback, cache_key, feedback)
         
-        # Create feedback object
-        feedback = AnswerFeedback(
-            feedback=feedback_data["feedback"],
-            score=float(feedback_data["score"]),
-            strengths=feedback_data["strengths"],
-            weaknesses=feedback_data["weaknesses"],
-            improvement_suggestions=feedback_data["improvement_suggestions"]
+        # Update answer with feedback in a fresh, short transaction
+        stmt = (
+            update(Answer)
+            .where(Answer.id == answer_id)
+            .values(feedback=feedback.feedback, feedback_score=feedback.score)
+            .execution_options(synchronize_session=False)
         )
+        await asyncio.to_thread(db.execute, stmt)
+        await asyncio.to_thread(db.commit)
         
-        # Update answer with feedback
-        answer.feedback = feedback.feedback
-        answer.feedback_score = feedback.score
-        
-        db.add(answer)
-        db.commit()
-        db.refresh(answer)
+        if result is None:
+            logger.info(f"Reused cached feedback for answer {answer_id} with score {feedback.score}")
+            return feedback
         
         logger.info(f"Generated feedback for answer {answer_id} with score {feedback.score}")
         
@@ -219,6 +334,123 @@ async def generate_feedback(
         return None
 
 
+async def generate_feedback_batch(
+    db: Session,
+    answer_ids: List[str],
+    feedback_type: Optional[str] = None,
+    concurrency: int = 8
+) -> Dict[str, Optional[AnswerFeedback]]:
+    """
+    Generate AI feedback for several answers, with up to `concurrency` AI requests in flight.
+    
+    Args:
+        db: Database session
+        answer_ids: IDs of the answers to generate feedback for
+        feedback_type: Type of feedback (general, technical, behavioral); by
+            default it is chosen from each question's category
+        concurrency: Maximum number of concurrent AI requests
+        
+    Returns:
+        Mapping of answer ID to AnswerFeedback, or None where generation failed
+    """
+    # Load every answer with its question in one query, off the event loop
+    answers = await asyncio.to_thread(
+        db.query(Answer)
+        .options(joinedload(Answer.question))
+        .filter(Answer.id.in_(answer_ids))
+        .all
+    )
+    answers = [answer for answer in answers if answer.content]
+    
+    from app.services.ai import get_default_ai_service
+    
+    ai_service = get_default_ai_service()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def generate_one(answer: Answer) -> AnswerFeedback:
+        answer_feedback_type = _resolve_feedback_type(answer, feedback_type)
+        cache_key = feedback_cache_key(answer.question_id, answer_feedback_type, answer.content)
+        
+        # Reuse feedback already generated for the same answer to this question
+        feedback = await asyncio.to_thread(get_cached_feedback, cache_key)
+        if feedback is not None:
+            return feedback
+        
+        async with semaphore:
+            result = await ai_service.generate_feedback(
+                question=answer.question.content,
+                answer=answer.content,
+                feedback_type=answer_feedback_type
+            )
+        feedback = AnswerFeedback.model_validate_json(result.content)
+        await asyncio.to_thread(store_feedback, cache_key, feedback)
+        return feedback
+    
+    results = await asyncio.gather(
+        *(generate_one(answer) for answer in answers),
+        return_exceptions=True
+    )
+    
+    feedbacks: Dict[str, Optional[AnswerFeedback]] = {answer_id: None for answer_id in answer_ids}
+    for answer, result in zip(answers, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error generating feedback for answer {answer.id}: {str(result)}")
+            continue
+        
+        answer.feedback = result.feedback
+        answer.feedback_score = result.score
+        feedbacks[answer.id] = result
+    
+    # Save all generated feedback in one transaction
+    await asyncio.to_thread(db.commit)
+    
+    logger.info(f"Generated feedback for {sum(f is not None for f in feedbacks.values())}/{len(answer_ids)} answers")
+    return feedbacks
+
+
+async def _transcribe_segmented(audio_path: str, duration: float) -> TranscriptionResult:
+    """
+    Transcribe a long recording by splitting it and transcribing the segments concurrently.
+    
+    Segment texts are joined in order and confidences are averaged, weighted by
+    segment duration.
+    """
+    with tempfile.TemporaryDirectory(prefix="segments_") as segment_dir:
+        segments = await audio_utils.split_audio(
+            audio_path,
+            output_dir=segment_dir,
+            segment_duration=TRANSCRIPTION_SEGMENT_DURATION
+        )
+        
+        semaphore = asyncio.Semaphore(TRANSCRIPTION_CONCURRENCY)
+        
+        async def transcribe_one(segment_path: str) -> TranscriptionResult:
+            async with semaphore:
+                return await default_transcription_service.transcribe_file(file_path=segment_path)
+        
+        results = await asyncio.gather(*(transcribe_one(segment) for segment in segments))
+    
+    if not results:
+        raise audio_utils.AudioProcessingError(f"No segments produced for {audio_path}")
+    
+    weights = [
+        max(min(TRANSCRIPTION_SEGMENT_DURATION, duration - i * TRANSCRIPTION_SEGMENT_DURATION), 0.0)
+        for i in range(len(results))
+    ]
+    total_weight = sum(weights)
+    if total_weight:
+        confidence = sum(result.confidence * weight for result, weight in zip(results, weights)) / total_weight
+    else:
+        confidence = sum(result.confidence for result in results) / len(results)
+    
+    return TranscriptionResult(
+        text=" ".join(result.text.strip() for result in results if result.text.strip()),
+        confidence=confidence,
+        language=results[0].language,
+        metadata={"segments": len(results)}
+    )
+
+
 async def transcribe_audio(
     db: Session, 
     answer_id: str, 
@@ -235,7 +467,7 @@ async def transcribe_audio(
     Returns:
         Transcribed text or None if transcription failed
     """
-    answer = get_answer_by_id(db, answer_id)
+    answer = await asyncio.to_thread(get_answer_by_id, db, answer_id)
     if not answer:
         logger.error(f"Answer with ID {answer_id} not found")
         return None
@@ -246,24 +478,41 @@ async def transcribe_audio(
             logger.error(f"Audio file not found: {audio_path}")
             return None
         
-        # Use the transcription service to transcribe audio
-        transcription_result = await default_transcription_service.transcribe_file(
-            file_path=audio_path
-        )
+        # Long recordings are split and their segments transcribed concurrently
+        duration = answer.duration
+        if duration is None and audio_utils.check_ffmpeg_installed():
+            try:
+                duration = (await audio_utils.get_audio_info(audio_path)).get("duration")
+            except audio_utils.AudioProcessingError as e:
+                logger.warning(f"Could not determine audio duration: {str(e)}")
+        
+        if duration and duration > SEGMENTED_TRANSCRIPTION_THRESHOLD and audio_utils.check_ffmpeg_installed():
+            transcription_result = await _transcribe_segmented(audio_path, duration)
+        else:
+            # Use the transcription service to transcribe audio
+            transcription_result = await default_transcription_service.transcribe_file(
+                file_path=audio_path
+            )
         
         # Get transcribed text
         transcription = transcription_result.text
         
         # Update the answer with transcription
-        answer.content = transcription
+        values = {"content": transcription}
         
         # Store confidence if available
-        if hasattr(answer, 'transcription_confidence') and transcription_result.confidence is not None:
-            answer.transcription_confidence = transcription_result.confidence
+        if hasattr(Answer, 'transcription_confidence') and transcription_result.confidence is not None:
+            values["transcription_confidence"] = transcription_result.confidence
         
-        db.add(answer)
-        db.commit()
-        db.refresh(answer)
+        # Write the columns directly, without dirty-checking the loaded answer
+        stmt = (
+            update(Answer)
+            .where(Answer.id == answer_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await asyncio.to_thread(db.execute, stmt)
+        await asyncio.to_thread(db.commit)
         
         logger.info(f"Transcribed audio for answer {answer_id} with confidence {transcription_result.confidence:.2f}")
         return transcription
@@ -285,37 +534,41 @@ def get_answer_statistics(
     if user_id:
         query = query.join(Interview, Answer.interview_id == Interview.id).filter(Interview.user_id == user_id)
     
-    # Total answers
-    total_answers = query.count()
-    
-    # Average feedback score
-    avg_score = query.with_entities(func.avg(Answer.feedback_score)).scalar() or 0
+    # Totals in a single round-trip
+    total_answers, avg_score, with_feedback = query.with_entities(
+        func.count(Answer.id),
+        func.avg(Answer.feedback_score),
+        func.count(Answer.feedback)
+    ).one()
+    avg_score = avg_score or 0
     
-    # Count of answers with feedback
-    with_feedback = query.filter(Answer.feedback.isnot(None)).count()
-    
-    # Count by month (last 6 months)
+    # Count by month (last 6 months), grouped in the database
     current_date = datetime.utcnow()
-    month_counts = []
-    
+    months = []
     for i in range(5, -1, -1):
-        month = (current_date.month - i) % 12 or 12
-        year = current_date.year - ((current_date.month - i - 1) // 12)
-        
-        count = (
-            query
-            .filter(
-                func.extract('month', Answer.created_at) == month,
-                func.extract('year', Answer.created_at) == year
-            )
-            .count()
-        )
-        
-        month_counts.append({
+        month = (current_date.month - i - 1) % 12 + 1
+        year = current_date.year + (current_date.month - i - 1) // 12
+        months.append((year, month))
+    
+    year_col = extract('year', Answer.created_at)
+    month_col = extract('month', Answer.created_at)
+    rows = (
+        query
+        .with_entities(year_col, month_col, func.count(Answer.id))
+        .filter(Answer.created_at >= datetime(months[0][0], months[0][1], 1))
+        .group_by(year_col, month_col)
+        .all()
+    )
+    counts = {(int(year), int(month)): count for year, month, count in rows}
+    
+    month_counts = [
+        {
             "month": month,
             "year": year,
-            "count": count
-        })
+            "count": counts.get((year, month), 0)
+        }
+        for year, month in months
+    ]
     
     return {
         "total_answers": total_answers,
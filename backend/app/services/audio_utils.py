@@ -5,40 +5,75 @@ This module provides helpers for common audio tasks like format conversion,
 normalization, and other pre-processing needed before transcription.
 """
 
+import asyncio
+import functools
+import glob
 import os
-import tempfile
+import re
+import shutil
 import logging
-import subprocess
 from pathlib import Path
 from typing import Optional, Tuple, List
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+
 
 class AudioProcessingError(Exception):
     """Exception raised when audio processing fails."""
     pass
 
 
+async def _run_command(cmd: List[str], capture_stdout: bool = False) -> Tuple[int, bytes, str]:
+    """
+    Run an FFmpeg/FFprobe command without blocking the event loop.
+    
+    Args:
+        cmd: Command and arguments to run
+        capture_stdout: Whether to collect stdout; otherwise it is discarded
+            at the OS level (default: False)
+    
+    Returns:
+        Tuple[int, bytes, str]: Return code, raw stdout (empty unless captured)
+            and decoded stderr of the process
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await proc.communicate()
+    return proc.returncode, stdout or b"", stderr.decode(errors="replace")
+
+
+def _parse_duration(ffmpeg_output: str) -> Optional[float]:
+    """
+    Extract the "Duration: HH:MM:SS.ss" FFmpeg prints for its input, in seconds.
+    """
+    match = _DURATION_RE.search(ffmpeg_output)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+@functools.lru_cache(maxsize=1)
 def check_ffmpeg_installed() -> bool:
     """
     Check if FFmpeg is installed and available in the system path.
     
+    The lookup is done once per process, without spawning FFmpeg.
+    
     Returns:
         bool: True if FFmpeg is installed, False otherwise
     """
-    try:
-        result = subprocess.run(
-            ["ffmpeg", "-version"], 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE
-        )
-        return result.returncode == 0
-    except FileNotFoundError:
-        return False
+    return shutil.which("ffmpeg") is not None
 
 
-def get_audio_info(file_path: str) -> dict:
+async def get_audio_info(file_path: str) -> dict:
     """
     Get information about an audio file using FFmpeg.
     
@@ -60,25 +95,19 @@ def get_audio_info(file_path: str) -> dict:
     
     try:
         # Run FFprobe to get file information in JSON format
-        result = subprocess.run(
-            [
-                "ffprobe", 
-                "-v", "quiet", 
-                "-print_format", "json", 
-                "-show_format", 
-                "-show_streams", 
-                file_path
-            ], 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        returncode, stdout, stderr = await _run_command([
+            "ffprobe", 
+            "-v", "quiet", 
+            "-print_format", "json", 
+            "-show_format", 
+            "-show_streams", 
+            file_path
+        ], capture_stdout=True)
         
-        if result.returncode != 0:
-            raise AudioProcessingError(f"Failed to get audio info: {result.stderr}")
+        if returncode != 0:
+            raise AudioProcessingError(f"Failed to get audio info: {stderr}")
         
-        import json
-        info = json.loads(result.stdout)
+        info = orjson.loads(stdout)
         
         # Extract relevant information
         audio_info = {
@@ -104,7 +133,7 @@ def get_audio_info(file_path: str) -> dict:
         raise AudioProcessingError(f"Error getting audio information: {str(e)}")
 
 
-def convert_audio_format(
+async def convert_audio_format(
     input_path: str, 
     output_format: str = "wav",
     output_path: Optional[str] = None,
@@ -155,15 +184,10 @@ def convert_audio_format(
         cmd.extend(["-y", output_path])
         
         # Run FFmpeg
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        returncode, _, stderr = await _run_command(cmd)
         
-        if result.returncode != 0:
-            raise AudioProcessingError(f"Conversion failed: {result.stderr}")
+        if returncode != 0:
+            raise AudioProcessingError(f"Conversion failed: {stderr}")
         
         return output_path
     
@@ -171,7 +195,7 @@ def convert_audio_format(
         raise AudioProcessingError(f"Error converting audio: {str(e)}")
 
 
-def normalize_audio(
+async def normalize_audio(
     input_path: str,
     output_path: Optional[str] = None,
     target_level: float = -3.0
@@ -212,15 +236,10 @@ def normalize_audio(
             "-y", output_path
         ]
         
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        returncode, _, stderr = await _run_command(cmd)
         
-        if result.returncode != 0:
-            raise AudioProcessingError(f"Normalization failed: {result.stderr}")
+        if returncode != 0:
+            raise AudioProcessingError(f"Normalization failed: {stderr}")
         
         return output_path
     
@@ -228,7 +247,7 @@ def normalize_audio(
         raise AudioProcessingError(f"Error normalizing audio: {str(e)}")
 
 
-def remove_silence(
+async def remove_silence(
     input_path: str, 
     output_path: Optional[str] = None,
     silence_threshold: float = -50.0,
@@ -271,15 +290,10 @@ def remove_silence(
             "-y", output_path
         ]
         
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        returncode, _, stderr = await _run_command(cmd)
         
-        if result.returncode != 0:
-            raise AudioProcessingError(f"Silence removal failed: {result.stderr}")
+        if returncode != 0:
+            raise AudioProcessingError(f"Silence removal failed: {stderr}")
         
         return output_path
     
@@ -287,7 +301,7 @@ def remove_silence(
         raise AudioProcessingError(f"Error removing silence: {str(e)}")
 
 
-def split_audio(
+async def split_audio(
     input_path: str,
     output_dir: Optional[str] = None,
     segment_duration: float = 60.0
@@ -336,34 +350,23 @@ def split_audio(
             "-y", output_pattern
         ]
         
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        returncode, _, stderr = await _run_command(cmd)
         
-        if result.returncode != 0:
-            raise AudioProcessingError(f"Splitting failed: {result.stderr}")
-        
-        # Get the list of generated files
-        segments = []
-        i = 0
-        while True:
-            segment_path = os.path.join(output_dir, f"{input_filename}_{i:03d}{input_ext}")
-            if os.path.exists(segment_path):
-                segments.append(segment_path)
-                i += 1
-            else:
-                break
+        if returncode != 0:
+            raise AudioProcessingError(f"Splitting failed: {stderr}")
         
-        return segments
+        # Get the list of generated files with a single directory scan
+        segment_glob = os.path.join(
+            glob.escape(output_dir),
+            f"{glob.escape(input_filename)}_[0-9][0-9][0-9]{glob.escape(input_ext)}"
+        )
+        return sorted(glob.glob(segment_glob))
     
     except Exception as e:
         raise AudioProcessingError(f"Error splitting audio: {str(e)}")
 
 
-def prepare_for_transcription(
+async def prepare_for_transcription(
     input_path: str,
     output_path: Optional[str] = None,
     normalize: bool = True,
@@ -371,11 +374,11 @@ def prepare_for_transcription(
     target_format: str = "wav",
     target_sample_rate: int = 16000,
     target_channels: int = 1
-) -> str:
+) -> Tuple[str, Optional[float]]:
     """
     Prepare an audio file for optimal transcription.
     
-    This function applies a series of processing steps to optimize audio for speech-to-text:
+    This function applies the following processing in a single FFmpeg pass:
     1. Convert to the target format (default: WAV)
     2. Normalize audio levels (optional)
     3. Remove background noise (optional)
@@ -392,7 +395,8 @@ def prepare_for_transcription(
         target_channels: Target number of channels (default: 1 for mono)
         
     Returns:
-        str: Path to the processed audio file
+        Tuple[str, Optional[float]]: Path to the processed audio file and its
+            duration in seconds, as reported by FFmpeg (None if unavailable)
         
     Raises:
         AudioProcessingError: If processing fails
@@ -409,84 +413,34 @@ def prepare_for_transcription(
         input_filename = os.path.splitext(os.path.basename(input_path))[0]
         output_path = os.path.join(input_dir, f"{input_filename}_processed.{target_format}")
     
-    try:
-        # Create a temp file for intermediate processing
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f".{target_format}")
-        temp_path = temp_file.name
-        temp_file.close()
-        
-        current_path = input_path
-        
-        # Step 1: Convert to target format with specified sample rate and channels
-        current_path = convert_audio_format(
-            current_path,
-            output_format=target_format,
-            output_path=temp_path,
-            sample_rate=target_sample_rate,
-            channels=target_channels
-        )
-        
-        # Step 2: Normalize audio levels if requested
-        if normalize:
-            normalize_temp = tempfile.NamedTemporaryFile(delete=False, suffix=f".{target_format}")
-            normalize_temp_path = normalize_temp.name
-            normalize_temp.close()
-            
-            current_path = normalize_audio(
-                current_path,
-                output_path=normalize_temp_path
-            )
-            
-            # Clean up previous temp file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-            
-            temp_path = normalize_temp_path
-        
-        # Step 3: Apply noise reduction if requested
-        if remove_background_noise:
-            noise_reduction_temp = tempfile.NamedTemporaryFile(delete=False, suffix=f".{target_format}")
-            noise_reduction_temp_path = noise_reduction_temp.name
-            noise_reduction_temp.close()
-            
-            # Run FFmpeg with noise reduction filter
-            cmd = [
-                "ffmpeg",
-                "-i", current_path,
-                "-af", "afftdn=nf=-25",  # Adaptive FFT noise filter
-                "-y", noise_reduction_temp_path
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                logger.warning(f"Noise reduction failed, using normalized audio: {result.stderr}")
-            else:
-                # Clean up previous temp file
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                
-                current_path = noise_reduction_temp_path
-                temp_path = noise_reduction_temp_path
-        
-        # Move the final temp file to the output path
-        import shutil
-        shutil.move(current_path, output_path)
-        
-        # Clean up any remaining temp files
-        if os.path.exists(temp_path) and temp_path != current_path:
-            os.unlink(temp_path)
-        
-        return output_path
+    # Chain every requested filter into one graph so the audio is decoded
+    # and encoded once, straight to the output path
+    filters = []
+    if normalize:
+        filters.append("loudnorm=I=-3.0:TP=-1.5:LRA=11")
+    if remove_background_noise:
+        filters.append("afftdn=nf=-25")  # Adaptive FFT noise filter
     
+    cmd = [
+        "ffmpeg",
+        "-i", input_path,
+        "-ar", str(target_sample_rate),
+        "-ac", str(target_channels),
+    ]
+    if filters:
+        cmd.extend(["-af", ",".join(filters)])
+    cmd.extend(["-y", output_path])
+    
+    try:
+        returncode, _, stderr = await _run_command(cmd)
     except Exception as e:
-        # Clean up temp files on error
-        if 'temp_path' in locals() and os.path.exists(temp_path):
-            os.unlink(temp_path)
-            
         raise AudioProcessingError(f"Error preparing audio for transcription: {str(e)}")
+    
+    if returncode != 0:
+        # Don't leave a partially written output behind
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+        raise AudioProcessingError(f"Error preparing audio for transcription: {stderr}")
+    
+    # FFmpeg reports the input duration on stderr, which saves a separate ffprobe
+    return output_path, _parse_duration(stderr)
@@ -1,9 +1,14 @@
 from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import and_, case, desc, func, or_
+from datetime import datetime, timedelta
 
 from app.models.billing_history import BillingHistory, BillingEventType
 from app.schemas.subscription import BillingHistoryResponse
+from app.core.cache import cached, BILLING_STATISTICS_CACHE_KEY
+
+# Billing stats change slowly; cache them briefly (invalidated when events are recorded)
+BILLING_STATISTICS_CACHE_TTL = 300
 
 
 def get_billing_history_by_id(db: Session, id: str) -> Optional[BillingHistory]:
@@ -13,19 +18,45 @@ def get_billing_history_by_id(db: Session, id: str) -> Optional[BillingHistory]:
     return db.query(BillingHistory).filter(BillingHistory.id == id).first()
 
 
+def _page_after(query, before_time: Optional[datetime], before_id: Optional[str]):
+    """
+    Order a billing history query newest first, starting after a keyset cursor.
+    
+    The id breaks ties between events recorded at the same time.
+    """
+    if before_time is not None:
+        if before_id is not None:
+            query = query.filter(
+                or_(
+                    BillingHistory.event_time < before_time,
+                    and_(BillingHistory.event_time == before_time, BillingHistory.id < before_id)
+                )
+            )
+        else:
+            query = query.filter(BillingHistory.event_time < before_time)
+    
+    return query.order_by(desc(BillingHistory.event_time), desc(BillingHistory.id))
+
+
 def get_user_billing_history(
     db: Session,
     user_id: str,
     skip: int = 0,
     limit: int = 100,
     event_type: Optional[BillingEventType] = None,
-    visible_only: bool = True
+    visible_only: bool = True,
+    before_time: Optional[datetime] = None,
+    before_id: Optional[str] = None
 ) -> List[BillingHistory]:
     """
     Get billing history for a user with optional filtering.
+    
+    Pass the event_time and id of the last record seen as `before_time` and
+    `before_id` to fetch the next page without an OFFSET scan.
     """
     query = (
         db.query(BillingHistory)
+        .options(raiseload("*"))  # Relationships are never needed for listings
         .filter(BillingHistory.user_id == user_id)
     )
     
@@ -36,8 +67,8 @@ def get_user_billing_history(
     if visible_only:
         query = query.filter(BillingHistory.is_visible_to_customer == True)
     
-    # Order by event time descending (newest first)
-    query = query.order_by(desc(BillingHistory.event_time))
+    # Order by event time descending (newest first), resuming after the cursor
+    query = _page_after(query, before_time, before_id)
     
     # Apply pagination
     return query.offset(skip).limit(limit).all()
@@ -49,13 +80,18 @@ def get_subscription_billing_history(
     skip: int = 0,
     limit: int = 100,
     event_type: Optional[BillingEventType] = None,
-    visible_only: bool = True
+    visible_only: bool = True,
+    before_time: Optional[datetime] = None,
+    before_id: Optional[str] = None
 ) -> List[BillingHistory]:
     """
     Get billing history for a specific subscription with optional filtering.
+    
+    Supports the same `before_time`/`before_id` cursor as get_user_billing_history.
     """
     query = (
         db.query(BillingHistory)
+        .options(raiseload("*"))
         .filter(BillingHistory.subscription_id == subscription_id)
     )
     
@@ -66,8 +102,8 @@ def get_subscription_billing_history(
     if visible_only:
         query = query.filter(BillingHistory.is_visible_to_customer == True)
     
-    # Order by event time descending (newest first)
-    query = query.order_by(desc(BillingHistory.event_time))
+    # Order by event time descending (newest first), resuming after the cursor
+    query = _page_after(query, before_time, before_id)
     
     # Apply pagination
     return query.offset(skip).limit(limit).all()
@@ -77,13 +113,18 @@ def search_billing_history(
     db: Session,
     search_term: str,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    before_time: Optional[datetime] = None,
+    before_id: Optional[str] = None
 ) -> List[BillingHistory]:
     """
     Search billing history records for admin purposes.
+    
+    Supports the same `before_time`/`before_id` cursor as get_user_billing_history.
     """
     query = (
         db.query(BillingHistory)
+        .options(raiseload("*"))
         .filter(
             BillingHistory.description.ilike(f"%{search_term}%") |
             BillingHistory.invoice_id.ilike(f"%{search_term}%") |
@@ -93,57 +134,46 @@ def search_billing_history(
         )
     )
     
-    # Order by event time descending (newest first)
-    query = query.order_by(desc(BillingHistory.event_time))
+    # Order by event time descending (newest first), resuming after the cursor
+    query = _page_after(query, before_time, before_id)
     
     # Apply pagination
     return query.offset(skip).limit(limit).all()
 
 
+@cached(ttl=BILLING_STATISTICS_CACHE_TTL, key=BILLING_STATISTICS_CACHE_KEY)
 def get_billing_statistics(db: Session) -> Dict[str, Any]:
     """
     Get statistics on billing events for administrative purposes.
-    """
-    # Total billing events
-    total_events = db.query(BillingHistory).count()
     
-    # Events by type
-    events_by_type = (
+    The result changes slowly, so it is cached for a short TTL.
+    """
+    # One pass over billing history: counts per (event type, payment status),
+    # each with how many fell in the last 30 days
+    recent_cutoff = datetime.utcnow() - timedelta(days=30)
+    rows = (
         db.query(
             BillingHistory.event_type,
-            db.func.count(BillingHistory.id).label("count")
-        )
-        .group_by(BillingHistory.event_type)
-        .all()
-    )
-    
-    event_type_dict = {
-        event_type.value: count for event_type, count in events_by_type
-    }
-    
-    # Success vs. failed payments
-    payment_events = (
-        db.query(
             BillingHistory.payment_status,
-            db.func.count(BillingHistory.id).label("count")
+            func.count(BillingHistory.id).label("count"),
+            func.count(case((BillingHistory.event_time >= recent_cutoff, 1))).label("recent")
         )
-        .filter(BillingHistory.payment_status.isnot(None))
-        .group_by(BillingHistory.payment_status)
+        .group_by(BillingHistory.event_type, BillingHistory.payment_status)
         .all()
     )
     
-    payment_status_dict = {
-        status.value: count for status, count in payment_events
-    }
-    
-    # Recent activity (last 30 days count)
-    recent_count = (
-        db.query(db.func.count(BillingHistory.id))
-        .filter(
-            BillingHistory.event_time >= db.func.current_timestamp() - db.func.interval('30 days')
-        )
-        .scalar() or 0
-    )
+    total_events = 0
+    recent_count = 0
+    event_type_dict: Dict[str, int] = {}
+    payment_status_dict: Dict[str, int] = {}
+    for event_type, payment_status, count, recent in rows:
+        total_events += count
+        recent_count += recent
+        event_type_dict[event_type.value] = event_type_dict.get(event_type.value, 0) + count
+        
+        # Success vs. failed payments
+        if payment_status is not None:
+            payment_status_dict[payment_status.value] = payment_status_dict.get(payment_status.value, 0) + count
     
     return {
         "total_events": total_events,
@@ -0,0 +1,52 @@
+from typing import Optional
+import hashlib
+import logging
+import re
+
+from app.core.cache import cache_get, cache_set
+from app.core.config import settings
+from app.schemas.answer import AnswerFeedback
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "feedback:v1:"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_answer(content: str) -> str:
+    """
+    Normalize answer text so trivially different submissions share a cache entry.
+    """
+    return _WHITESPACE_RE.sub(" ", content).strip().lower()
+
+
+def feedback_cache_key(question_id: str, feedback_type: Optional[str], content: str) -> str:
+    """
+    Build the cache key for feedback on an answer to a question.
+    """
+    digest = hashlib.sha256(
+        f"{question_id}|{feedback_type or ''}|{normalize_answer(content)}".encode()
+    ).hexdigest()
+    return f"{KEY_PREFIX}{digest}"
+
+
+def get_cached_feedback(key: str) -> Optional[AnswerFeedback]:
+    """
+    Return previously generated feedback stored under `key`, if any.
+    """
+    raw = cache_get(key)
+    if raw is None:
+        return None
+    try:
+        return AnswerFeedback.model_validate_json(raw)
+    except Exception as e:
+        logger.warning(f"Discarding unreadable feedback cache entry {key}: {str(e)}")
+        return None
+
+
+def store_feedback(key: str, feedback: AnswerFeedback) -> None:
+    """
+    Store generated feedback under `key` for FEEDBACK_CACHE_TTL seconds.
+    """
+    cache_set(key, feedback.model_dump_json().encode(), settings.FEEDBACK_CACHE_TTL)
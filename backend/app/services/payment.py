@@ -1,18 +1,28 @@
 from typing import Optional, List, Dict, Any, Union
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import and_, func, desc, extract, or_, update
+from sqlalchemy.exc import IntegrityError
+import asyncio
 import logging
 import stripe
 import json
 from datetime import datetime
+from uuid import uuid4
 
 from app.models.payment import Payment, PaymentStatus, PaymentType
-from app.models.user import User
 from app.schemas.payment import PaymentCreate, PaymentUpdate, PaymentIntentResponse
 from app.core.config import settings
+from app.db.session import is_foreign_key_violation
+from app.core.cache import cached, invalidate_cache, PAYMENT_STATISTICS_CACHE_KEY
 
 logger = logging.getLogger(__name__)
 
+# Columns update_payment may set
+_PAYMENT_COLUMNS = frozenset(Payment.__table__.columns.keys())
+
+# Payment stats change slowly; cache them briefly (invalidated on payment writes)
+PAYMENT_STATISTICS_CACHE_TTL = 300
+
 # Initialize Stripe client
 if settings.STRIPE_API_KEY:
     stripe.api_key = settings.STRIPE_API_KEY
@@ -41,11 +51,20 @@ def get_user_payments(
     limit: int = 100,
     payment_type: Optional[PaymentType] = None,
     status: Optional[PaymentStatus] = None,
+    before_time: Optional[datetime] = None,
+    before_id: Optional[str] = None,
 ) -> List[Payment]:
     """
     Get payments for a user with optional filtering.
+    
+    Pass the created_at and id of the last payment seen as `before_time` and
+    `before_id` to fetch the next page without an OFFSET scan.
     """
-    query = db.query(Payment).filter(Payment.user_id == user_id)
+    query = (
+        db.query(Payment)
+        .options(raiseload("*"))  # Relationships are never needed for listings
+        .filter(Payment.user_id == user_id)
+    )
     
     if payment_type:
         query = query.filter(Payment.payment_type == payment_type)
@@ -53,8 +72,20 @@ def get_user_payments(
     if status:
         query = query.filter(Payment.status == status)
     
+    # Resume after the keyset cursor; the id breaks ties within a timestamp
+    if before_time is not None:
+        if before_id is not None:
+            query = query.filter(
+                or_(
+                    Payment.created_at < before_time,
+                    and_(Payment.created_at == before_time, Payment.id < before_id)
+                )
+            )
+        else:
+            query = query.filter(Payment.created_at < before_time)
+    
     # Order by creation date, newest first
-    query = query.order_by(desc(Payment.created_at))
+    query = query.order_by(desc(Payment.created_at), desc(Payment.id))
     
     return query.offset(skip).limit(limit).all()
 
@@ -63,11 +94,6 @@ def create_payment(db: Session, obj_in: PaymentCreate) -> Payment:
     """
     Create a new payment record.
     """
-    # Verify user exists
-    user = db.query(User).filter(User.id == obj_in.user_id).first()
-    if not user:
-        raise ValueError(f"User with ID {obj_in.user_id} not found")
-    
     # Create payment record
     db_obj = Payment(
         user_id=obj_in.user_id,
@@ -82,9 +108,17 @@ def create_payment(db: Session, obj_in: PaymentCreate) -> Payment:
         payment_metadata=obj_in.payment_metadata,
     )
     
+    # The user_id foreign key guarantees the user exists
     db.add(db_obj)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if is_foreign_key_violation(e):
+            raise ValueError(f"User with ID {obj_in.user_id} not found") from e
+        raise
     db.refresh(db_obj)
+    invalidate_cache(PAYMENT_STATISTICS_CACHE_KEY)
     
     logger.info(f"Created new payment: {db_obj.id} for user {db_obj.user_id}")
     return db_obj
@@ -97,20 +131,31 @@ def update_payment(
 ) -> Payment:
     """
     Update a payment record.
+    
+    The returned payment is detached from the session with all of its
+    columns loaded; its relationships are not.
     """
     if isinstance(obj_in, dict):
         update_data = obj_in
     else:
         update_data = obj_in.model_dump(exclude_unset=True)
     
-    # Update payment with new data
-    for field in update_data:
-        if hasattr(db_obj, field):
-            setattr(db_obj, field, update_data[field])
+    values = {field: value for field, value in update_data.items() if field in _PAYMENT_COLUMNS}
+    if not values:
+        return db_obj
     
-    db.add(db_obj)
+    # Update payment with new data in one UPDATE, reading the row back
+    db_obj = db.scalars(
+        update(Payment)
+        .where(Payment.id == db_obj.id)
+        .values(**values)
+        .returning(Payment)
+    ).one()
+    
+    # Detach before committing so the loaded columns aren't expired and re-selected
+    db.expunge(db_obj)
     db.commit()
-    db.refresh(db_obj)
+    invalidate_cache(PAYMENT_STATISTICS_CACHE_KEY)
     
     logger.info(f"Updated payment: {db_obj.id}")
     return db_obj
@@ -162,38 +207,47 @@ def create_payment_intent(
         raise
 
 
-def get_payment_methods(user_id: str, stripe_customer_id: str) -> List[Dict[str, Any]]:
+def _list_card_payment_methods(stripe_customer_id: str) -> List[Dict[str, Any]]:
+    """
+    Fetch and format every saved card for a Stripe customer, following pagination.
+    """
+    payment_methods = stripe.PaymentMethod.list(
+        customer=stripe_customer_id,
+        type="card",
+        limit=100
+    )
+    
+    # Format the payment methods
+    formatted_methods = []
+    for pm in payment_methods.auto_paging_iter():
+        card = pm.card
+        formatted_methods.append({
+            "id": pm.id,
+            "type": pm.type,
+            "card": {
+                "brand": card.brand,
+                "last4": card.last4,
+                "exp_month": card.exp_month,
+                "exp_year": card.exp_year,
+            },
+            "billing_details": pm.billing_details,
+            "created": datetime.fromtimestamp(pm.created)
+        })
+    
+    return formatted_methods
+
+
+async def get_payment_methods(user_id: str, stripe_customer_id: str) -> List[Dict[str, Any]]:
     """
     Get saved payment methods for a user from Stripe.
+    
+    The blocking Stripe calls run in a worker thread so the event loop stays free.
     """
     if not settings.STRIPE_API_KEY:
         raise ValueError("Stripe API key not configured")
     
     try:
-        # Get payment methods from Stripe
-        payment_methods = stripe.PaymentMethod.list(
-            customer=stripe_customer_id,
-            type="card"
-        )
-        
-        # Format the payment methods
-        formatted_methods = []
-        for pm in payment_methods.data:
-            card = pm.card
-            formatted_methods.append({
-                "id": pm.id,
-                "type": pm.type,
-                "card": {
-                    "brand": card.brand,
-                    "last4": card.last4,
-                    "exp_month": card.exp_month,
-                    "exp_year": card.exp_year,
-                },
-                "billing_details": pm.billing_details,
-                "created": datetime.fromtimestamp(pm.created)
-            })
-        
-        return formatted_methods
+        return await asyncio.to_thread(_list_card_payment_methods, stripe_customer_id)
         
     except stripe.error.StripeError as e:
         logger.error(f"Stripe error: {str(e)}")
@@ -203,6 +257,37 @@ def get_payment_methods(user_id: str, stripe_customer_id: str) -> List[Dict[str,
         raise
 
 
+def _insert_payment_if_absent(db: Session, values: Dict[str, Any]) -> Optional[str]:
+    """
+    Insert a payment unless one with the same Stripe payment ID exists.
+    
+    Returns the new payment's ID, or None if the payment was already recorded.
+    Raises ValueError if the payment's user does not exist.
+    """
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    
+    try:
+        payment_id = db.execute(
+            dialect_insert(Payment)
+            .values(id=str(uuid4()), **values)
+            .on_conflict_do_nothing(index_elements=["stripe_payment_id"])
+            .returning(Payment.id)
+        ).scalar_one_or_none()
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if is_foreign_key_violation(e):
+            raise ValueError(f"User {values['user_id']} not found") from e
+        raise
+    
+    if payment_id:
+        invalidate_cache(PAYMENT_STATISTICS_CACHE_KEY)
+    return payment_id
+
+
 def process_payment_webhook(db: Session, event_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Process Stripe webhook events related to payments.
@@ -242,11 +327,8 @@ def process_payment_webhook(db: Session, event_data: Dict[str, Any]) -> Dict[str
             logger.error("No payment ID in webhook event")
             return {"status": "error", "message": "No payment ID in event"}
         
-        # Find payment in our database
-        payment = get_payment_by_stripe_id(db, stripe_payment_id)
-        
-        # If payment doesn't exist and this is a successful charge, create it
-        if not payment and event_type == "charge.succeeded":
+        # For a successful charge, record the payment unless it already exists
+        if event_type == "charge.succeeded":
             # Extract user ID from metadata
             metadata = payment_data.get("metadata", {})
             user_id = metadata.get("user_id")
@@ -255,52 +337,60 @@ def process_payment_webhook(db: Session, event_data: Dict[str, Any]) -> Dict[str
                 logger.error("No user ID in payment metadata")
                 return {"status": "error", "message": "No user ID in payment metadata"}
             
-            # Create new payment record
             payment_type_value = metadata.get("payment_type", PaymentType.ONE_TIME.value)
             try:
                 payment_type = PaymentType(payment_type_value)
             except ValueError:
                 payment_type = PaymentType.ONE_TIME
             
-            payment = create_payment(
-                db,
-                PaymentCreate(
-                    user_id=user_id,
-                    stripe_payment_id=stripe_payment_id,
-                    amount=payment_data.get("amount") / 100,  # Convert from cents
-                    currency=payment_data.get("currency", "usd"),
-                    status=PaymentStatus.SUCCEEDED,
-                    payment_type=payment_type,
-                    description=payment_data.get("description"),
-                    payment_method=payment_data.get("payment_method_details", {}).get("type"),
-                    receipt_url=payment_data.get("receipt_url"),
-                    payment_metadata=json.dumps(metadata)
-                )
-            )
+            # Insert atomically; a retried or concurrent delivery hits the
+            # stripe_payment_id unique constraint and inserts nothing
+            try:
+                payment_id = _insert_payment_if_absent(db, {
+                    "user_id": user_id,
+                    "stripe_payment_id": stripe_payment_id,
+                    "amount": payment_data.get("amount") / 100,  # Convert from cents
+                    "currency": payment_data.get("currency", "usd"),
+                    "status": PaymentStatus.SUCCEEDED,
+                    "payment_type": payment_type,
+                    "description": payment_data.get("description"),
+                    "payment_method": payment_data.get("payment_method_details", {}).get("type"),
+                    "receipt_url": payment_data.get("receipt_url"),
+                    "payment_metadata": json.dumps(metadata),
+                })
+            except ValueError as e:
+                logger.error(f"Cannot record payment {stripe_payment_id}: {str(e)}")
+                return {"status": "error", "message": str(e)}
             
-            return {
-                "status": "created",
-                "event_type": event_type,
-                "payment_id": payment.id
-            }
+            if payment_id:
+                logger.info(f"Created new payment: {payment_id} for user {user_id}")
+                return {
+                    "status": "created",
+                    "event_type": event_type,
+                    "payment_id": payment_id
+                }
         
-        # If payment exists, update its status
-        if payment:
-            stripe_status = payment_data.get("status")
-            if stripe_status in payment_status_mapping:
-                status = payment_status_mapping[stripe_status]
-                
-                # Update payment status
-                update_payment(
-                    db,
-                    payment,
-                    {"status": status}
-                )
-                
+        # Otherwise update the existing payment's status in place
+        stripe_status = payment_data.get("status")
+        if stripe_status in payment_status_mapping:
+            status = payment_status_mapping[stripe_status]
+            
+            payment_id = db.execute(
+                update(Payment)
+                .where(Payment.stripe_payment_id == stripe_payment_id)
+                .values(status=status)
+                .returning(Payment.id)
+                .execution_options(synchronize_session=False)
+            ).scalar_one_or_none()
+            db.commit()
+            
+            if payment_id:
+                invalidate_cache(PAYMENT_STATISTICS_CACHE_KEY)
+                logger.info(f"Updated payment: {payment_id}")
                 return {
                     "status": "updated",
                     "event_type": event_type,
-                    "payment_id": payment.id,
+                    "payment_id": payment_id,
                     "new_status": status.value
                 }
         
@@ -311,25 +401,14 @@ def process_payment_webhook(db: Session, event_data: Dict[str, Any]) -> Dict[str
         return {"status": "error", "message": str(e)}
 
 
+@cached(ttl=PAYMENT_STATISTICS_CACHE_TTL, key=PAYMENT_STATISTICS_CACHE_KEY)
 def get_payment_statistics(db: Session) -> Dict[str, Any]:
     """
     Get statistics on payments.
-    """
-    # Total payments amount
-    total_amount = (
-        db.query(func.sum(Payment.amount))
-        .filter(Payment.status == PaymentStatus.SUCCEEDED)
-        .scalar() or 0
-    )
     
-    # Total payments count
-    total_count = (
-        db.query(func.count(Payment.id))
-        .filter(Payment.status == PaymentStatus.SUCCEEDED)
-        .scalar() or 0
-    )
-    
-    # Payments by type
+    The result changes slowly, so it is cached for a short TTL.
+    """
+    # Payments by type; the overall totals are summed from these groups
     type_counts = (
         db.query(
             Payment.payment_type,
@@ -347,39 +426,37 @@ def get_payment_statistics(db: Session) -> Dict[str, Any]:
             "amount": float(amount) if amount else 0
         } for t, count, amount in type_counts
     }
+    total_count = sum(count for _, count, _ in type_counts)
+    total_amount = sum(amount or 0 for _, _, amount in type_counts)
     
-    # Payments by month (last 6 months)
+    # Payments by month (last 6 months), grouped in the database
     current_date = datetime.utcnow()
-    month_stats = []
-    
+    months = []
     for i in range(5, -1, -1):
-        month = (current_date.month - i) % 12 or 12
-        year = current_date.year - ((current_date.month - i - 1) // 12)
-        
-        amount = (
-            db.query(func.sum(Payment.amount))
-            .filter(
-                Payment.status == PaymentStatus.SUCCEEDED,
-                func.extract('month', Payment.created_at) == month,
-                func.extract('year', Payment.created_at) == year
-            )
-            .scalar() or 0
-        )
-        
-        count = (
-            db.query(func.count(Payment.id))
-            .filter(
-                Payment.status == PaymentStatus.SUCCEEDED,
-                func.extract('month', Payment.created_at) == month,
-                func.extract('year', Payment.created_at) == year
-            )
-            .scalar() or 0
+        month = (current_date.month - i - 1) % 12 + 1
+        year = current_date.year + (current_date.month - i - 1) // 12
+        months.append((year, month))
+    
+    year_col = extract('year', Payment.created_at)
+    month_col = extract('month', Payment.created_at)
+    rows = (
+        db.query(year_col, month_col, func.count(Payment.id), func.sum(Payment.amount))
+        .filter(
+            Payment.status == PaymentStatus.SUCCEEDED,
+            Payment.created_at >= datetime(months[0][0], months[0][1], 1)
         )
-        
+        .group_by(year_col, month_col)
+        .all()
+    )
+    totals = {(int(year), int(month)): (count, amount) for year, month, count, amount in rows}
+    
+    month_stats = []
+    for year, month in months:
+        count, amount = totals.get((year, month), (0, 0))
         month_stats.append({
             "month": month,
             "year": year,
-            "amount": float(amount),
+            "amount": float(amount or 0),
             "count": count
         })
     
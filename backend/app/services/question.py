@@ -1,19 +1,41 @@
 from typing import Optional, List, Dict, Any, Union, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct, and_, or_
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import func, distinct, and_, or_, insert, update, bindparam
+from sqlalchemy.exc import IntegrityError
 import logging
 
 from app.models.question import Question, QuestionDifficulty, QuestionType
 from app.models.interview import Interview
+from app.db.session import is_foreign_key_violation
 from app.schemas.question import (
     QuestionCreate, 
     QuestionUpdate, 
     QuestionSearch,
+    QuestionStatistics,
     CategoryCount
 )
+from app.core.cache import (
+    cached,
+    invalidate_cache,
+    QUESTION_STATISTICS_CACHE_KEY,
+    QUESTION_CATEGORIES_CACHE_KEY
+)
 
 logger = logging.getLogger(__name__)
 
+# Columns update_question may set
+_QUESTION_COLUMNS = frozenset(Question.__table__.columns.keys())
+
+# Question stats change slowly; cache them briefly (invalidated on question writes)
+QUESTION_STATISTICS_CACHE_TTL = 300
+
+
+def _invalidate_question_statistics() -> None:
+    """
+    Drop the cached question statistics after questions change.
+    """
+    invalidate_cache(QUESTION_STATISTICS_CACHE_KEY, QUESTION_CATEGORIES_CACHE_KEY)
+
 
 def get_question_by_id(db: Session, id: str) -> Optional[Question]:
     """
@@ -33,8 +55,11 @@ def get_questions(
 ) -> List[Question]:
     """
     Get questions with optional filtering.
+    
+    Relationships are not loaded; accessing one on a result raises instead of
+    issuing a query per question.
     """
-    query = db.query(Question)
+    query = db.query(Question).options(raiseload("*"))
     
     if interview_id:
         query = query.filter(Question.interview_id == interview_id)
@@ -62,7 +87,7 @@ def search_questions(
     Search questions with various filters and text search.
     Returns a tuple of (questions, total_count)
     """
-    query = db.query(Question)
+    query = db.query(Question).options(raiseload("*"))
     
     # Apply filters
     if search_params.question_type:
@@ -85,24 +110,40 @@ def search_questions(
             )
         )
     
-    # Get total count before pagination
-    total_count = query.count()
+    # Fetch the page together with the total match count (computed over the
+    # whole filtered set by the window function, before OFFSET/LIMIT apply)
+    rows = (
+        query
+        .add_columns(func.count().over().label("total_count"))
+        .order_by(Question.position)
+        .offset(search_params.offset)
+        .limit(search_params.limit)
+        .all()
+    )
     
-    # Apply pagination
-    questions = query.order_by(Question.position).offset(search_params.offset).limit(search_params.limit).all()
+    if rows:
+        total_count = rows[0].total_count
+    elif search_params.offset:
+        # Paged past the end, so no row carries the total; count separately
+        total_count = query.count()
+    else:
+        total_count = 0
     
+    questions = [row[0] for row in rows]
     return questions, total_count
 
 
+def _interview_exists(db: Session, interview_id: str) -> bool:
+    """
+    Check whether an interview exists without loading it.
+    """
+    return db.query(Interview.id).filter(Interview.id == interview_id).first() is not None
+
+
 def create_question(db: Session, obj_in: QuestionCreate) -> Question:
     """
     Create a new question.
     """
-    # Verify that the interview exists
-    interview = db.query(Interview).filter(Interview.id == obj_in.interview_id).first()
-    if not interview:
-        raise ValueError(f"Interview with ID {obj_in.interview_id} not found")
-    
     # Create new question
     db_obj = Question(
         content=obj_in.content,
@@ -115,9 +156,17 @@ def create_question(db: Session, obj_in: QuestionCreate) -> Question:
         is_ai_generated=False,  # Default to false, can be set later
     )
     
+    # The interview_id foreign key guarantees the interview exists
     db.add(db_obj)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if is_foreign_key_violation(e):
+            raise ValueError(f"Interview with ID {obj_in.interview_id} not found") from e
+        raise
     db.refresh(db_obj)
+    _invalidate_question_statistics()
     
     logger.info(f"Created new question: {db_obj.id}")
     return db_obj
@@ -130,33 +179,47 @@ def create_bulk_questions(
 ) -> List[Question]:
     """
     Create multiple questions at once for an interview.
-    """
-    # Verify that the interview exists
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
-    if not interview:
-        raise ValueError(f"Interview with ID {interview_id} not found")
-    
-    # Create and add all questions
-    db_objs = []
-    for i, question in enumerate(questions):
-        db_obj = Question(
-            content=question.content,
-            question_type=question.question_type,
-            difficulty=question.difficulty,
-            category=question.category,
-            expected_answer=question.expected_answer,
-            position=question.position or i,  # Use provided position or index
-            interview_id=interview_id,
-            is_ai_generated=False,
-        )
-        db.add(db_obj)
-        db_objs.append(db_obj)
-    
-    db.commit()
     
-    # Refresh all objects
+    The returned questions are detached from the session with all of their
+    columns loaded; their relationships are not.
+    """
+    # Insert all questions and read back their generated columns in one
+    # statement; the interview_id foreign key guarantees the interview exists
+    rows = [
+        {
+            "content": question.content,
+            "question_type": question.question_type,
+            "difficulty": question.difficulty,
+            "category": question.category,
+            "expected_answer": question.expected_answer,
+            "position": question.position or i,  # Use provided position or index
+            "interview_id": interview_id,
+            "is_ai_generated": False,
+        }
+        for i, question in enumerate(questions)
+    ]
+    if not rows:
+        # Nothing to insert, so the foreign key can't vouch for the interview
+        if not _interview_exists(db, interview_id):
+            raise ValueError(f"Interview with ID {interview_id} not found")
+        return []
+    
+    try:
+        db_objs = db.scalars(
+            insert(Question).returning(Question, sort_by_parameter_order=True),
+            rows
+        ).all()
+    except IntegrityError as e:
+        db.rollback()
+        if is_foreign_key_violation(e):
+            raise ValueError(f"Interview with ID {interview_id} not found") from e
+        raise
+    
+    # Detach before committing so the loaded columns aren't expired and re-selected
     for db_obj in db_objs:
-        db.refresh(db_obj)
+        db.expunge(db_obj)
+    db.commit()
+    _invalidate_question_statistics()
     
     logger.info(f"Created {len(db_objs)} questions for interview {interview_id}")
     return db_objs
@@ -169,20 +232,31 @@ def update_question(
 ) -> Question:
     """
     Update a question.
+    
+    The returned question is detached from the session with all of its
+    columns loaded; its relationships are not.
     """
     if isinstance(obj_in, dict):
         update_data = obj_in
     else:
         update_data = obj_in.model_dump(exclude_unset=True)
     
-    # Update question with new data
-    for field in update_data:
-        if hasattr(db_obj, field):
-            setattr(db_obj, field, update_data[field])
+    values = {field: value for field, value in update_data.items() if field in _QUESTION_COLUMNS}
+    if not values:
+        return db_obj
     
-    db.add(db_obj)
+    # Update question with new data in one UPDATE, reading the row back
+    db_obj = db.scalars(
+        update(Question)
+        .where(Question.id == db_obj.id)
+        .values(**values)
+        .returning(Question)
+    ).one()
+    
+    # Detach before committing so the loaded columns aren't expired and re-selected
+    db.expunge(db_obj)
     db.commit()
-    db.refresh(db_obj)
+    _invalidate_question_statistics()
     
     logger.info(f"Updated question: {db_obj.id}")
     return db_obj
@@ -195,14 +269,18 @@ def delete_question(db: Session, db_obj: Question) -> Question:
     question_id = db_obj.id
     db.delete(db_obj)
     db.commit()
+    _invalidate_question_statistics()
     
     logger.info(f"Deleted question: {question_id}")
     return db_obj
 
 
+@cached(ttl=QUESTION_STATISTICS_CACHE_TTL, key=QUESTION_CATEGORIES_CACHE_KEY, model=CategoryCount)
 def get_question_categories(db: Session) -> List[CategoryCount]:
     """
     Get all unique categories with their question counts.
+    
+    The result changes slowly, so it is cached for a short TTL.
     """
     results = (
         db.query(
@@ -221,9 +299,12 @@ def get_question_categories(db: Session) -> List[CategoryCount]:
     ]
 
 
-def get_question_statistics(db: Session) -> Dict[str, Any]:
+@cached(ttl=QUESTION_STATISTICS_CACHE_TTL, key=QUESTION_STATISTICS_CACHE_KEY, model=QuestionStatistics)
+def get_question_statistics(db: Session) -> QuestionStatistics:
     """
     Get statistics on questions (counts by difficulty, type, etc.).
+    
+    The result changes slowly, so it is cached for a short TTL.
     """
     # Total questions count
     total_questions = db.query(func.count(Question.id)).scalar()
@@ -259,41 +340,53 @@ def get_question_statistics(db: Session) -> Dict[str, Any]:
     # Categories with counts
     category_counts = get_question_categories(db)
     
-    return {
-        "total_questions": total_questions,
-        "by_difficulty": difficulty_dict,
-        "by_type": type_dict,
-        "by_category": category_counts
-    }
+    return QuestionStatistics(
+        total_questions=total_questions,
+        by_difficulty=difficulty_dict,
+        by_type=type_dict,
+        by_category=category_counts
+    )
 
 
 def reorder_questions(db: Session, interview_id: str, question_ids: List[str]) -> List[Question]:
     """
     Reorder questions within an interview.
     """
-    # Verify interview exists
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
-    if not interview:
-        raise ValueError(f"Interview with ID {interview_id} not found")
-    
-    # Update positions based on the provided order
-    questions = []
-    for i, question_id in enumerate(question_ids):
-        question = db.query(Question).filter(
-            Question.id == question_id,
-            Question.interview_id == interview_id
-        ).first()
-        
-        if question:
-            question.position = i
-            db.add(question)
-            questions.append(question)
-    
+    if not question_ids:
+        # Nothing to reorder, but an unknown interview is still an error
+        if not _interview_exists(db, interview_id):
+            raise ValueError(f"Interview with ID {interview_id} not found")
+        return []
+    
+    # Update every position with one executemany UPDATE
+    stmt = (
+        update(Question.__table__)
+        .where(
+            Question.__table__.c.id == bindparam("question_id"),
+            Question.__table__.c.interview_id == interview_id
+        )
+        .values(position=bindparam("new_position"))
+    )
+    db.execute(
+        stmt,
+        [
+            {"question_id": question_id, "new_position": i}
+            for i, question_id in enumerate(question_ids)
+        ]
+    )
     db.commit()
     
-    # Refresh all questions
-    for question in questions:
-        db.refresh(question)
+    # Load the reordered questions in one query, in their new order
+    questions = (
+        db.query(Question)
+        .filter(Question.interview_id == interview_id, Question.id.in_(question_ids))
+        .order_by(Question.position)
+        .all()
+    )
+    
+    # Nothing matched; only now is it worth checking whether the interview exists
+    if not questions and not _interview_exists(db, interview_id):
+        raise ValueError(f"Interview with ID {interview_id} not found")
     
     logger.info(f"Reordered {len(questions)} questions for interview {interview_id}")
     return questions
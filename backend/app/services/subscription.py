@@ -2,7 +2,7 @@ from typing import Optional, List, Dict, Any, Union
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 import logging
-import json
+import orjson
 from datetime import datetime, timedelta
 
 from app.models.subscription import (
@@ -13,6 +13,7 @@ from app.models.subscription import (
 from app.models.subscription_plan import SubscriptionPlan
 from app.models.billing_history import BillingHistory, BillingEventType, PaymentStatus as BillingPaymentStatus
 from app.models.user import User
+from app.core.cache import invalidate_cache, ADMIN_DASHBOARD_CACHE_KEY, BILLING_STATISTICS_CACHE_KEY
 from app.schemas.subscription import (
     SubscriptionCreate, 
     SubscriptionUpdate,
@@ -101,6 +102,7 @@ def create_subscription(db: Session, obj_in: SubscriptionCreate) -> Subscription
     db.commit()
     db.refresh(db_obj)
     
+    invalidate_cache(ADMIN_DASHBOARD_CACHE_KEY)
     logger.info(f"Created new subscription: {db_obj.id} for user {db_obj.user_id}")
     return db_obj
 
@@ -127,6 +129,7 @@ def update_subscription(
     db.commit()
     db.refresh(db_obj)
     
+    invalidate_cache(ADMIN_DASHBOARD_CACHE_KEY)
     logger.info(f"Updated subscription: {db_obj.id}")
     return db_obj
 
@@ -173,6 +176,7 @@ def cancel_subscription(
         description=f"Subscription canceled {'at period end' if at_period_end else 'immediately'}"
     )
     
+    invalidate_cache(ADMIN_DASHBOARD_CACHE_KEY)
     logger.info(f"Canceled subscription: {db_obj.id}, at period end: {at_period_end}")
     return db_obj
 
@@ -217,6 +221,7 @@ def reactivate_subscription(db: Session, db_obj: Subscription) -> Subscription:
         description="Subscription reactivated"
     )
     
+    invalidate_cache(ADMIN_DASHBOARD_CACHE_KEY)
     logger.info(f"Reactivated subscription: {db_obj.id}")
     return db_obj
 
@@ -355,10 +360,10 @@ def create_subscription_with_stripe(
                 amount=plan.price_yearly if billing_period == SubscriptionBillingPeriod.YEARLY else plan.price_monthly,
                 currency=plan.currency,
                 payment_method_id=payment_method_id,
-                subscription_metadata=json.dumps({
+                subscription_metadata=orjson.dumps({
                     "stripe_customer_id": customer.id,
                     "price_id": price_id
-                })
+                }).decode()
             )
         )
         
@@ -603,6 +608,7 @@ def create_billing_history_record(
     db.add(billing_record)
     db.commit()
     db.refresh(billing_record)
+    invalidate_cache(BILLING_STATISTICS_CACHE_KEY)
     
     return billing_record
 
@@ -803,7 +809,7 @@ def create_billing_portal_session_url(db: Session, user_id: str, return_url: str
         raise ValueError("No subscription metadata found")
     
     try:
-        metadata = json.loads(subscription.subscription_metadata)
+        metadata = orjson.loads(subscription.subscription_metadata)
         customer_id = metadata.get("stripe_customer_id")
         
         if not customer_id:
@@ -350,7 +350,7 @@ def get_plan_details(plan: SubscriptionPlan, billing_cycle: str = "monthly") ->
     return PlanDetails(
         id=plan.code,
         name=plan.name,
-        description=plan.description,
+        description=plan.description or "",
         price=price,
         currency=plan.currency.lower(),
         interval=billing_cycle,
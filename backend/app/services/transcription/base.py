@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List, Tuple
 from pydantic import BaseModel
+import asyncio
 import logging
 import time
 from functools import wraps
@@ -72,7 +73,7 @@ def retry_on_error(max_retries=3, delay=1.0, backoff=2.0,
                         raise
                     
                     logger.warning(f"Retry {retries}/{max_retries} for {func.__name__} after error: {str(e)}")
-                    time.sleep(current_delay)
+                    await asyncio.sleep(current_delay)
                     current_delay *= backoff
         return wrapper
     return decorator
@@ -99,23 +100,29 @@ class BaseTranscriptionService(ABC):
             Tuple of (is_allowed, reason)
         """
         now = time.time()
-        
-        # Remove timestamps older than a day
         day_ago = now - 86400  # 24 hours in seconds
-        self._request_timestamps = [ts for ts in self._request_timestamps if ts > day_ago]
+        minute_ago = now - 60
+        
+        # Drop timestamps older than a day and count the last minute in one pass
+        kept = []
+        recent_requests = 0
+        for ts in self._request_timestamps:
+            if ts > day_ago:
+                kept.append(ts)
+                if ts > minute_ago:
+                    recent_requests += 1
+        self._request_timestamps = kept
         
         # Check daily limit
-        if len(self._request_timestamps) >= self.rate_limit.requests_per_day:
+        if len(kept) >= self.rate_limit.requests_per_day:
             return False, "Daily rate limit exceeded"
         
         # Check per-minute limit
-        minute_ago = now - 60
-        recent_requests = sum(1 for ts in self._request_timestamps if ts > minute_ago)
         if recent_requests >= self.rate_limit.requests_per_minute:
             return False, "Per-minute rate limit exceeded"
         
         # Request is allowed, add timestamp
-        self._request_timestamps.append(now)
+        kept.append(now)
         return True, ""
         
     @abstractmethod
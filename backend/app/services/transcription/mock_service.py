@@ -3,7 +3,6 @@ import json
 import random
 from typing import Dict, Any, Optional, List, Tuple
 import logging
-import time
 import asyncio
 from pathlib import Path
 
@@ -124,10 +123,9 @@ class MockTranscriptionService(BaseTranscriptionService):
         # Return a random response
         return random.choice(responses)
     
-    def _simulate_processing_delay(self):
-        """Simulate processing delay"""
-        delay = random.uniform(self.latency[0], self.latency[1])
-        time.sleep(delay)
+    async def _simulate_processing_delay(self, delay_factor: float = 1.0):
+        """Simulate processing delay without blocking the event loop"""
+        await asyncio.sleep(random.uniform(self.latency[0], self.latency[1]) * delay_factor)
     
     def _create_mock_words_data(self, text: str) -> List[Dict[str, Any]]:
         """Create mock word-level data for the transcription"""
@@ -170,7 +168,7 @@ class MockTranscriptionService(BaseTranscriptionService):
             raise AudioProcessingError("Empty audio data")
             
         # Simulate processing delay
-        self._simulate_processing_delay()
+        await self._simulate_processing_delay()
         
         # Random chance of error
         if random.random() < self.error_rate:
@@ -218,7 +216,7 @@ class MockTranscriptionService(BaseTranscriptionService):
         
         # Simulate processing delay scaled by file size
         delay_factor = min(5.0, file_size / (1024 * 1024))  # Cap at 5 seconds for large files
-        time.sleep(random.uniform(self.latency[0], self.latency[1]) * delay_factor)
+        await self._simulate_processing_delay(delay_factor)
         
         # Random chance of error
         if random.random() < self.error_rate:
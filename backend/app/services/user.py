@@ -52,9 +52,17 @@ def get_users(
     return query.offset(skip).limit(limit).all()
 
 
-def create_user(db: Session, obj_in: UserCreate) -> User:
+def create_user(
+    db: Session, 
+    obj_in: UserCreate, 
+    is_superuser: bool = False,
+    commit: bool = True
+) -> User:
     """
     Create a new user.
+    
+    With commit=False the user is only flushed, so the caller can finish its
+    own changes and commit them in the same transaction.
     """
     # Check if email is already registered
     if get_user_by_email(db, email=obj_in.email):
@@ -69,12 +77,15 @@ def create_user(db: Session, obj_in: UserCreate) -> User:
         name=obj_in.name,
         hashed_password=get_password_hash(obj_in.password),
         is_active=True,
-        is_superuser=False,
+        is_superuser=is_superuser,
     )
     
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    if commit:
+        db.commit()
+        db.refresh(db_obj)
+    else:
+        db.flush()
     
     logger.info(f"Created new user: {db_obj.email}")
     return db_obj